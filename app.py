@@ -1,17 +1,53 @@
+import os
+import sys
+
+# 'eventlet' serves thousands of websocket clients on green threads; 'threading' is the Werkzeug server.
+# Picked before anything else is imported because eventlet has to patch the standard library first:
+# --production always means eventlet, --dev always means threading, otherwise PUMPEDUP_ASYNC_MODE decides.
+if __name__ == '__main__' and '--production' in sys.argv:
+    ASYNC_MODE = 'eventlet'
+elif __name__ == '__main__' and '--dev' in sys.argv:
+    ASYNC_MODE = 'threading'
+else:
+    ASYNC_MODE = os.environ.get('PUMPEDUP_ASYNC_MODE', 'threading')
+if ASYNC_MODE == 'eventlet':
+    import eventlet
+    eventlet.monkey_patch()
+
+import argparse
+from urllib.parse import urlsplit
 from flask import Flask, render_template_string, request, jsonify
 import pandas as pd
-from flask_socketio import SocketIO
+from flask_socketio import SocketIO, join_room, leave_room
+import heapq
 import json
-from datetime import datetime, timedelta
+import sqlite3
+import threading
+import time
+from collections import Counter
 import plotly.express as px
 import plotly.graph_objects as go
 import plotly.io as pio
+from bot.broadcast import BROADCAST_TICK, BroadcastScheduler
+from bot.dashboard_store import DashboardStore
+from bot.events import coin_time_ms, trade_time_ms
+from bot.market_stats import MarketStats, STATS_WINDOW_MS
+from bot.metrics import registry
+from bot.publisher import DASHBOARD_URL
+from bot.records import DISPLAY_FIELDS, TokenRecord, TradeRecord
+from bot.tick_store import TICK_STORE_PATH, TickStore
 
 app = Flask(__name__)
-socketio = SocketIO(app)
+socketio = SocketIO(app, async_mode=ASYNC_MODE)
 
-new_coins = {}
-trades = {}
+dashboard = DashboardStore()
+broadcaster = BroadcastScheduler()
+broadcast_tick = float(os.environ.get('PUMPEDUP_BROADCAST_TICK', BROADCAST_TICK))
+broadcast_task = None
+watching = {}  # sid -> mints the client subscribed to; clients not listed get everything
+watchers = Counter()  # mint -> number of clients watching it
+watch_lock = threading.Lock()  # Socket handler threads change watching/watchers while the broadcaster reads them
+portfolio_source = None  # Set by main.py --single-process: returns the live bot's portfolio
 
 @app.route('/')
 def index():
@@ -188,7 +224,7 @@ def index():
                 changeElement.className = `market-cap-change ${change >= 0 ? 'positive-change' : 'negative-change'}`;
             }
 
-            socket.on('new_coin', (coin) => {
+            function addCoin(coin) {
                 const div = document.createElement('div');
                 div.className = 'coin new';
                 div.id = `coin-${coin.mint}`;
@@ -213,15 +249,15 @@ def index():
                 `;
                 coinGrid.prepend(div);
                 coins[coin.mint] = coin;
-            });
+            }
 
-            socket.on('trade', (trade) => {
+            function addTrade(trade) {
                 const coinElement = document.getElementById(`coin-${trade.mint}`);
                 if (coinElement) {
                     const tradeDiv = document.createElement('div');
                     tradeDiv.className = 'trade trade-new';
                     tradeDiv.innerHTML = `
-                        <p>${trade.is_buy ? '🟢 Buy' : '🔴 Sell'}: ${trade.symbol} for ${trade.sol_amount / 1e9} SOL, <a href="https://pump.fun/profile/${trade.creator}" target="_blank" style="color: inherit; text-decoration: none;">check trader</a>
+                        <p>${trade.is_buy ? '🟢 Buy' : '🔴 Sell'}: ${trade.symbol} for ${trade.sol_amount / 1e9} SOL, <a href="https://pump.fun/profile/${trade.user}" target="_blank" style="color: inherit; text-decoration: none;">check trader</a>
                         <p>Price: $${parseFloat(trade.usd_market_cap / (trade.virtual_token_reserves / 1e9)).toFixed(6)}</p>
                     `;
                     const tradesContainer = coinElement.querySelector('.trades');
@@ -230,6 +266,54 @@ def index():
 
                     updateMarketCap(coinElement, parseFloat(trade.usd_market_cap));
                 }
+            }
+
+            const MAX_TRADES_SHOWN = 50;
+
+            function applyUpdate(mint, update) {
+                // One coalesced tick for a coin: a few compact trades and the latest market cap
+                const coinElement = document.getElementById(`coin-${mint}`);
+                if (!coinElement) return;
+                const coin = coins[mint];
+                const fragment = document.createDocumentFragment();
+                update.trades.forEach(([isBuy, solAmount, user, price]) => {
+                    const tradeDiv = document.createElement('div');
+                    tradeDiv.className = 'trade';
+                    tradeDiv.innerHTML = `
+                        <p>${isBuy ? '🟢 Buy' : '🔴 Sell'}: ${coin.symbol} for ${solAmount / 1e9} SOL, <a href="https://pump.fun/profile/${user}" target="_blank" style="color: inherit; text-decoration: none;">check trader</a>
+                        <p>Price: $${price === null ? 'n/a' : price.toFixed(6)}</p>
+                    `;
+                    fragment.prepend(tradeDiv);
+                });
+                const tradesContainer = coinElement.querySelector('.trades');
+                tradesContainer.prepend(fragment);
+                while (tradesContainer.children.length > MAX_TRADES_SHOWN) {
+                    tradesContainer.lastElementChild.remove();
+                }
+                if (update.usd_market_cap !== null) {
+                    updateMarketCap(coinElement, parseFloat(update.usd_market_cap));
+                }
+            }
+
+            // Only follow some coins: socket.emit('watch', [mint, ...]); an empty list follows everything again
+            function watch(mints) {
+                socket.emit('watch', mints);
+            }
+
+            function applyBatch(batch) {
+                batch.new_coins.forEach(addCoin);
+                batch.trades.forEach(addTrade);
+            }
+
+            socket.on('tick', (tick) => {
+                tick.coins.forEach(addCoin);
+                Object.entries(tick.updates).forEach(([mint, update]) => applyUpdate(mint, update));
+            });
+            socket.on('snapshot', async (data) => {
+                // Everything the server holds, as one deflate-compressed JSON batch
+                coinGrid.innerHTML = '';
+                const stream = new Blob([data]).stream().pipeThrough(new DecompressionStream('deflate'));
+                applyBatch(JSON.parse(await new Response(stream).text()));
             });
         </script>
     </body>
@@ -408,112 +492,253 @@ def stats():
 # Plotly.newPlot('totalMarketCap', data.total_market_cap_chart.data);
 #                         Plotly.newPlot('topCoins', data.top_coins_chart);
 #                         Plotly.newPlot('tradeVolume', data.trade_volume_chart);
-import pytz
-
-utc_zone = pytz.timezone('UTC')
-local_zone = pytz.timezone('America/New_York')
-
-
-@app.route('/api/stats')
-def api_stats():
-    df = pd.read_csv('market_data1.csv')
-    if df.empty:
-        return jsonify({})
-    # df['timestamp'] = pd.to_datetime(df['timestamp'])
-    # Convert 'created_timestamp' from Unix timestamp (milliseconds) to datetime
-    df['created_timestamp'] = pd.to_datetime(df['created_timestamp'], unit='ms')
-
-    # Get current time in UTC
-    now_utc = datetime.now(utc_zone)
-
-    # Calculate 'last_hour' in UTC
-    last_hour_utc = now_utc - timedelta(hours=1)
-
-    # Filter data for the last hour
-    # last_hour_utc = datetime.now() - timedelta(hours=1)
-    last_hour_utc_naive = last_hour_utc.replace(tzinfo=None) #tz_localize(None)
-
-    # Now you can safely compare 'last_hour_utc_naive' with 'df['created_timestamp']'
-    df_last_hour = df[df['created_timestamp'] > last_hour_utc_naive]
-    # df_last_hour = df[df['timestamp'] > last_hour]
-    df['created_timestamp'] = pd.to_datetime(df['created_timestamp'], unit='ms')
-
-    # Convert 'reply_count', 'price', 'market_cap', and 'usd_market_cap' to numeric types
-    df['reply_count'] = pd.to_numeric(df['reply_count'], errors='coerce')
-    df['price'] = pd.to_numeric(df['price'], errors='coerce')
-    df['market_cap'] = pd.to_numeric(df['market_cap'], errors='coerce')
-    df['usd_market_cap'] = pd.to_numeric(df['usd_market_cap'], errors='coerce')
-
-    # Total Market Cap Chart
-    total_market_cap = df_last_hour.groupby('created_timestamp')['usd_market_cap'].sum().reset_index()
+STATS_CACHE_SECONDS = 5  # Minimum age of the cached charts before they are rebuilt
+
+STATS_RENDER_SECONDS = registry.histogram('pumpedup_stats_render_seconds', "Time to rebuild the /api/stats charts")
+INGESTED = registry.counter('pumpedup_ingested_events_total', "Events received by the dashboard", ('type',))
+registry.gauge('pumpedup_dashboard_coins', "Coins held for the dashboard", lambda: len(dashboard))
+
+market_stats = MarketStats()
+stats_cache = {'version': None, 'built': float('-inf'), 'body': None}
+
+
+def load_market_stats(path=TICK_STORE_PATH):
+    # Seed the aggregates with the last hour of history recorded by the bot. The dashboard
+    # only reads the bot's store, and starts empty when there is none it can open yet.
+    if not os.path.exists(path):
+        print(f"No market history at {path}, starting with empty charts")
+        return
+    start_ms = int(time.time() * 1000) - STATS_WINDOW_MS
+    try:
+        tick_store = TickStore(path, readonly=True)
+        try:
+            coin_events = ((row['timestamp'], row, False) for row in tick_store.read_coins(start_ms))
+            trade_events = ((row['timestamp'], row, True) for row in tick_store.read_trades(start_ms))
+            for time_ms, row, is_trade in heapq.merge(coin_events, trade_events, key=lambda event: event[0]):
+                market_stats.record(row['mint'], row['symbol'], row['usd_market_cap'], time_ms, is_trade)
+        finally:
+            tick_store.close()
+    except sqlite3.Error as e:
+        print(f"Could not load market history from {path}: {e}")
+
+
+def build_stats_charts():
+    snapshot = market_stats.snapshot()
+    if not snapshot['total_by_minute']:
+        return snapshot['version'], json.dumps({})
+
+    minutes, totals = zip(*snapshot['total_by_minute'])
     total_market_cap_chart = {
-        'data': [go.Scatter(x=total_market_cap['created_timestamp'], y=total_market_cap['usd_market_cap'], mode='lines')],
+        'data': [go.Scatter(x=pd.to_datetime(minutes, unit='ms'), y=totals, mode='lines')],
         'layout': go.Layout(title='Total Market Cap (Last Hour)', xaxis_title='Time', yaxis_title='USD')
     }
 
-    # Top Coins by Market Cap
-    latest_data = df_last_hour.loc[df_last_hour.groupby('symbol')['created_timestamp'].idxmax()]
-    top_coins = latest_data.nlargest(5, 'usd_market_cap')
+    symbols, caps = zip(*snapshot['top_coins']) if snapshot['top_coins'] else ((), ())
     top_coins_chart = {
-        'data': [go.Bar(x=top_coins['symbol_address'], y=top_coins['usd_market_cap'])],
+        'data': [go.Bar(x=symbols, y=caps)],
         'layout': go.Layout(title='Top 5 Coins by Market Cap', xaxis_title='Symbol', yaxis_title='USD')
     }
 
-    # Trade Volume (assuming we have this data, if not, we'll need to modify the trading_bot.py to log it)
-    # For this example, we'll use a dummy calculation
-
-    # trade_volume = df_last_hour.groupby('symbol')['symbol'].count().reset_index().sort_values('symbol', ascending=False)
-    # trade_volume = df_last_hour.groupby('created_timestamp')['timestamp'].count().sort_values("price", ascending=False).reset_index()
-
-    trade_volume = df_last_hour.groupby('created_timestamp')['price'].count().reset_index()
-    
+    minutes, counts = zip(*snapshot['trades_by_minute']) if snapshot['trades_by_minute'] else ((), ())
     trade_volume_chart = {
-        'data': [go.Bar(x=trade_volume['created_timestamp'], y=trade_volume['price'])],
+        'data': [go.Bar(x=pd.to_datetime(minutes, unit='ms'), y=counts)],
         'layout': go.Layout(title='Trade Volume (Last Hour)', xaxis_title='Time', yaxis_title='Number of Trades')
     }
 
-    print("total_market_cap_chart, top_coins_chart, trade_volume_chart")
-
-    # return jsonify({
-    #     'total_market_cap_chart': total_market_cap_chart,
-    #     'top_coins_chart': top_coins_chart,
-    #     'trade_volume_chart': trade_volume_chart
-    # })
-
-    return {
+    return snapshot['version'], json.dumps({
         'total_market_cap_chart': pio.to_json(total_market_cap_chart),
         'top_coins_chart': pio.to_json(top_coins_chart),
         'trade_volume_chart': pio.to_json(trade_volume_chart)
-    }
+    })
+
 
+@app.route('/api/stats')
+def api_stats():
+    # Every viewer shares one serialized copy of the charts, rebuilt at most every STATS_CACHE_SECONDS
+    now = time.monotonic()
+    if stats_cache['version'] != market_stats.version and now - stats_cache['built'] >= STATS_CACHE_SECONDS:
+        stats_cache['version'], stats_cache['body'] = build_stats_charts()
+        stats_cache['built'] = now
+        STATS_RENDER_SECONDS.observe(time.monotonic() - now)
+    response = app.response_class(stats_cache['body'], mimetype='application/json')
+    response.set_etag(str(stats_cache['version']))
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+
+@app.route('/metrics')
+def metrics():
+    return app.response_class(registry.render(), mimetype='text/plain; version=0.0.4')
+
+
+@app.route('/api/portfolio')
+def api_portfolio():
+    if portfolio_source is None:
+        return jsonify({'error': 'the portfolio is only available when the bot runs in this process'}), 404
+    return jsonify(portfolio_source())
+
+
+EVENT_TIME_FIELDS = {'new_coin': 'created_timestamp', 'trade': 'timestamp'}  # Event type -> its timestamp field
+
+
+def event_error(event):
+    # Why an event cannot be ingested, or None; the whole batch is checked before any of it is applied
+    if not isinstance(event, dict):
+        return 'event is not an object'
+    time_field = EVENT_TIME_FIELDS.get(event.get('type'))
+    if time_field is None:
+        return f"unknown event type {event.get('type')!r}"
+    data = event.get('data')
+    if not isinstance(data, dict):
+        return 'event data is not an object'
+    if not isinstance(data.get('mint'), str) or not data['mint']:
+        return 'event has no mint'
+    timestamp = data.get(time_field)
+    if timestamp is not None and (isinstance(timestamp, bool) or not isinstance(timestamp, (int, float))):
+        return f"{time_field} is not a number"
+    return None
+
+
+def rejected(events):
+    # A 400 response naming the first bad event, or None when every event is valid
+    for position, event in enumerate(events):
+        error = event_error(event)
+        if error:
+            return jsonify({'error': f"event {position}: {error}"}), 400
+    return None
+
+
+@app.route('/ingest', methods=['POST'])
+def receive_events():
+    # Accepts a JSON array or an NDJSON body of {"type": "new_coin" | "trade", "data": {...}} events
+    if request.mimetype == 'application/x-ndjson':
+        try:
+            events = [json.loads(line) for line in request.get_data(as_text=True).splitlines() if line.strip()]
+        except ValueError as e:
+            return jsonify({'error': f'invalid NDJSON: {e}'}), 400
+    else:
+        events = request.get_json(silent=True)
+    if not isinstance(events, list):
+        return jsonify({'error': 'expected a list of events'}), 400
+    error = rejected(events)
+    if error:
+        return error
+    ingest_events(events)
+    return '', 204
 
 @app.route('/new_coin', methods=['POST'])
 def receive_new_coin():
-    coin_data = request.json
-    send_new_coin(coin_data)
+    events = [{'type': 'new_coin', 'data': request.get_json(silent=True)}]
+    error = rejected(events)
+    if error:
+        return error
+    ingest_events(events)
     return '', 204
 
 @app.route('/trade', methods=['POST'])
 def receive_trade():
-    trade_data = request.json
-    send_trade(trade_data)
+    events = [{'type': 'trade', 'data': request.get_json(silent=True)}]
+    error = rejected(events)
+    if error:
+        return error
+    ingest_events(events)
     return '', 204
 
+def coin_message(data):
+    display = {name: data[name] for name in DISPLAY_FIELDS if data.get(name) is not None}
+    return {**display, **TokenRecord(data).to_dict()}
+
 @socketio.on('connect')
 def handle_connect():
+    # One compressed snapshot to the new client only; coalesced ticks follow
     print('Client connected')
-    for coin in new_coins.values():
-        socketio.emit('new_coin', coin)
-    for trade in trades.values():
-        socketio.emit('trade', trade)
-
-def send_new_coin(coin_data):
-    new_coins[coin_data['mint']] = coin_data
-    socketio.emit('new_coin', coin_data)
-
-def send_trade(trade_data):
-    trades[trade_data['signature']] = trade_data
-    socketio.emit('trade', trade_data)
+    start_broadcaster()
+    join_room('all')
+    socketio.emit('snapshot', dashboard.compressed_snapshot(), to=request.sid)
+
+@socketio.on('watch')
+def handle_watch(mints):
+    # Moves the client from the 'all' room to one room per watched mint (or back, for an empty list)
+    unwatch(request.sid)
+    mints = set(mints or [])
+    if not mints:
+        join_room('all')
+        return
+    leave_room('all')
+    with watch_lock:
+        watching[request.sid] = mints
+        for mint in mints:
+            watchers[mint] += 1
+    for mint in mints:
+        join_room(f'mint:{mint}')
+
+@socketio.on('disconnect')
+def handle_disconnect():
+    unwatch(request.sid)
+
+def unwatch(sid):
+    with watch_lock:
+        mints = watching.pop(sid, ())
+        for mint in mints:
+            watchers[mint] -= 1
+            if not watchers[mint]:
+                del watchers[mint]
+    for mint in mints:
+        leave_room(f'mint:{mint}', sid=sid)
+
+def start_broadcaster():
+    global broadcast_task
+    if broadcast_task is None:
+        broadcast_task = socketio.start_background_task(broadcast_loop)
+
+def broadcast_loop():
+    # Runs for the life of the server: a failed tick is logged and the next one carries on
+    while True:
+        socketio.sleep(broadcast_tick)
+        try:
+            coins, updates = broadcaster.drain()
+            if coins or updates:
+                socketio.emit('tick', {'coins': coins, 'updates': updates}, to='all')
+            with watch_lock:
+                watched = set(watchers)
+            for mint in watched & updates.keys():
+                socketio.emit('tick', {'coins': [], 'updates': {mint: updates[mint]}}, to=f'mint:{mint}')
+        except Exception as e:
+            print(f"Error broadcasting tick: {e}")
+
+def ingest_events(events):
+    # Updates go to the broadcaster, which sends them to browsers on its next tick
+    start_broadcaster()
+    for event in events:
+        event_type = event.get('type')
+        data = event.get('data')
+        INGESTED.inc(event_type)
+        if event_type == 'new_coin':
+            message = coin_message(data)
+            dashboard.add_coin(message, coin_time_ms(data))
+            market_stats.record(message['mint'], message.get('symbol'), message.get('usd_market_cap'), coin_time_ms(data), False)
+            broadcaster.add_coin(message)
+        elif event_type == 'trade':
+            trade = TradeRecord(data)
+            dashboard.add_trade(trade, trade_time_ms(data))
+            market_stats.record(trade.mint, trade.symbol, trade.usd_market_cap, trade_time_ms(data), True)
+            broadcaster.add_trade(trade)
 
 if __name__ == '__main__':
-    socketio.run(app, host="0.0.0.0", port=5001, debug=True, allow_unsafe_werkzeug=True)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="pumpedup dashboard")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--production', action='store_true', help="serve with eventlet (what the container runs)")
+    mode.add_argument('--dev', action='store_true', help="serve with the Werkzeug debug server and reloader")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=urlsplit(DASHBOARD_URL).port,
+                        help="defaults to the port the bot publishes to")
+    args = parser.parse_args()
+    load_market_stats()
+    print(f"Serving the dashboard on {args.host}:{args.port} ({socketio.async_mode})")
+    if args.dev:
+        socketio.run(app, host=args.host, port=args.port, debug=True, allow_unsafe_werkzeug=True)
+    elif socketio.async_mode == 'threading':
+        # Without --production: the plain Werkzeug server, for local runs
+        socketio.run(app, host=args.host, port=args.port, allow_unsafe_werkzeug=True)
+    else:
+        socketio.run(app, host=args.host, port=args.port)
\ No newline at end of file
@@ -0,0 +1,85 @@
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import SyntheticFeed, frame
+from bot.decoder import JSON_BACKENDS, FrameDecoder
+from bot.recorder import RecordingReader
+
+
+def load_frames(path):
+    # A feed recording directory, or one raw Socket.IO frame per line, e.g. '42["tradeCreated",{...}]'
+    if os.path.isdir(path):
+        return [frame for received_ms, frame in RecordingReader(path).frames()]
+    with open(path) as frames_file:
+        return [line.rstrip('\n') for line in frames_file if line.strip()]
+
+
+def synthetic_frames(count, seed=0):
+    # pump.fun shaped events mixed with pings and events the bot does not handle
+    feed = SyntheticFeed(seed=seed)
+    rng = random.Random(seed)
+    frames = []
+    for i in range(count):
+        roll = rng.random()
+        if roll < 0.05:
+            frames.append('2')
+        elif roll < 0.15:
+            frames.append(frame('userActivity', {'user': f'user{i}', 'page': 'board'}))
+        else:
+            frames.append(frame(*feed.next_event()))
+    return frames
+
+
+def naive_decode(frames, loads):
+    # The original connect_websocket path: parse every '42' frame in full, then compare the event name
+    events = []
+    for message in frames:
+        if message.startswith("42"):
+            data = loads(message[2:])
+            if data[0] in ("newCoinCreated", "tradeCreated"):
+                events.append((data[0], data[1]))
+    return events
+
+
+def measure(name, decode, frames, repeat):
+    decode(frames)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        decode(frames)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    events = decode(frames)
+    after = tracemalloc.take_snapshot()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, 'filename'))
+    rate = len(frames) * repeat / elapsed
+    print(f"{name:<24} {rate:>12,.0f} msgs/s {blocks / len(frames):>10.1f} blocks/msg {peak / len(frames):>10.0f} peak B/msg"
+          f" {len(events):>8} events")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark of websocket frame decoding")
+    parser.add_argument('--frames', help="feed recording directory or file of raw frames, one per line (default: synthetic)")
+    parser.add_argument('--count', type=int, default=20000, help="synthetic frames to generate")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    frames = load_frames(args.frames) if args.frames else synthetic_frames(args.count)
+    print(f"{len(frames)} frames, {sum(map(len, frames)) / len(frames):.0f} bytes average")
+    for backend, loads in JSON_BACKENDS.items():
+        measure(f"naive/{backend}", lambda batch: naive_decode(batch, loads), frames, args.repeat)
+        decoder = FrameDecoder(backend=backend)
+        measure(f"FrameDecoder/{backend}", decoder.decode_batch, frames, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.feed_standin import FeedStandIn
+from benchmarks.synthetic import SyntheticFeed
+from bot.ai_strategy import AIStrategy
+
+
+async def check(args):
+    # Runs AIStrategy against a misbehaving local stand-in, reports how the feed coped and
+    # returns the checks that failed
+    standin = FeedStandIn(SyntheticFeed(rate=args.rate, burst_rate=args.rate * 5), ping_interval=args.ping_interval,
+                          ping_timeout=args.ping_timeout, drop_every=args.drop_every, hang_after=args.hang_after,
+                          jitter_ms=args.jitter_ms)
+    port = await standin.start()
+    strategy = AIStrategy(max_tokens=10000, verbose=False, feed_connections=args.connections,
+                          ws_urls=[f"ws://127.0.0.1:{port}/socket.io/?EIO=4&transport=websocket"])
+    processed = 0
+
+    def count(mint):
+        nonlocal processed
+        processed += 1
+
+    strategy.add_listener(count)
+    strategy.start_websocket()
+    await asyncio.sleep(args.duration)
+    strategy.stop_websocket()
+    await standin.stop()
+
+    print(f"Stand-in: {standin.connections} connections, {standin.sent} frames sent")
+    print(f"Events processed: {processed} token events, {strategy.decoder.decoded} frames decoded")
+    for feed in strategy.feeds:
+        stats = feed.stats()
+        gaps = sorted(feed.gaps)
+        print(f"{stats['name']}: {stats['connects']} connects, {stats['pings']} pings answered, "
+              f"{stats['stale_disconnects']} stale disconnects, {stats['received']} received, "
+              f"{stats['first']} first, {stats['duplicates']} duplicates")
+        if stats['lag_p50'] is not None:
+            print(f"  lag behind first copy: p50 {stats['lag_p50'] * 1000:.2f}ms, p99 {stats['lag_p99'] * 1000:.2f}ms")
+        if gaps:
+            print(f"  gaps: {len(gaps)}, median {gaps[len(gaps) // 2]:.3f}s, max {gaps[-1]:.3f}s")
+
+    failures = []
+    if processed == 0:
+        failures.append("no events were processed")
+    for feed in strategy.feeds:
+        stats = feed.stats()
+        if args.ping_interval / 1000 < args.duration and stats['pings'] == 0:
+            failures.append(f"{stats['name']} answered no pings")
+        if args.drop_every and args.drop_every < args.duration and not feed.gaps:
+            failures.append(f"{stats['name']} recorded no reconnect gaps although the server dropped it")
+        # A silent server is noticed one missed ping (interval + timeout) after it stops sending
+        detect_by = args.hang_after + (args.ping_interval + args.ping_timeout) / 1000 if args.hang_after is not None else None
+        if detect_by is not None and detect_by < args.duration and stats['stale_disconnects'] == 0:
+            failures.append(f"{stats['name']} never detected the silent server")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exercise heartbeat handling and reconnects against the stand-in feed")
+    parser.add_argument('--duration', type=float, default=15)
+    parser.add_argument('--rate', type=float, default=100)
+    parser.add_argument('--ping-interval', type=int, default=1000, help="ms")
+    parser.add_argument('--ping-timeout', type=int, default=1000, help="ms")
+    parser.add_argument('--drop-every', type=float, default=4, help="server closes connections after this many seconds")
+    parser.add_argument('--hang-after', type=float, help="server goes silent after this many seconds")
+    parser.add_argument('--connections', type=int, default=1, help="parallel feed connections to deduplicate")
+    parser.add_argument('--jitter-ms', type=float, default=0, help="random per-frame delay added by the server")
+    failures = asyncio.run(check(parser.parse_args()))
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        raise SystemExit(1)
+    print("PASS")
+
+
+if __name__ == '__main__':
+    main()
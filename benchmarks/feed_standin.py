@@ -0,0 +1,139 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import uuid
+import websockets
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import SyntheticFeed, frame
+
+
+class FeedStandIn:
+    # Local stand-in for the pump.fun Socket.IO feed (Engine.IO v4 over websocket).
+    # Broadcasts synthetic events to every client, pings every ping_interval and drops
+    # clients that do not answer. drop_every closes each connection after that many
+    # seconds; hang_after stops sending anything (pings included) while keeping the
+    # socket open, to exercise stale-connection detection.
+    def __init__(self, feed=None, ping_interval=25000, ping_timeout=20000, drop_every=None, hang_after=None, jitter_ms=0):
+        self.feed = feed or SyntheticFeed()
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
+        self.drop_every = drop_every
+        self.hang_after = hang_after
+        self.jitter_ms = jitter_ms
+        self.clients = set()
+        self.sent = 0
+        self.connections = 0
+        self.server = None
+        self.generator = None
+
+    async def start(self, host='127.0.0.1', port=0):
+        self.server = await websockets.serve(self.handler, host, port)
+        self.generator = asyncio.create_task(self.generate())
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.generator.cancel()
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def generate(self):
+        # Events are timed by the synthetic feed's clock, so bursts reach clients as bursts
+        last_ms = None
+        for event_type, data in iter(self.feed.next_event, None):
+            if last_ms is not None and self.feed.now_ms > last_ms:
+                await asyncio.sleep((self.feed.now_ms - last_ms) / 1000)
+            last_ms = self.feed.now_ms
+            message = frame(event_type, data)
+            for queue in list(self.clients):
+                queue.put_nowait(message)
+
+    async def handler(self, websocket, path=None):
+        self.connections += 1
+        sid = uuid.uuid4().hex
+        await websocket.send('0' + json.dumps({'sid': sid, 'upgrades': [], 'pingInterval': self.ping_interval,
+                                               'pingTimeout': self.ping_timeout, 'maxPayload': 1000000}))
+        if await websocket.recv() != '40':
+            return
+        await websocket.send('40' + json.dumps({'sid': uuid.uuid4().hex}))
+        queue = asyncio.Queue()
+        pong = asyncio.Event()
+        self.clients.add(queue)
+        tasks = [asyncio.create_task(self.send_events(websocket, queue)),
+                 asyncio.create_task(self.ping(websocket, pong)),
+                 asyncio.create_task(self.receive(websocket, pong))]
+        if self.drop_every:
+            tasks.append(asyncio.create_task(asyncio.sleep(self.drop_every)))
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.hang_after, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                # Go silent but keep the socket open
+                for task in tasks:
+                    task.cancel()
+                await websocket.wait_closed()
+        finally:
+            self.clients.discard(queue)
+            for task in tasks:
+                task.cancel()
+            await websocket.close()
+
+    async def send_events(self, websocket, queue):
+        while True:
+            message = await queue.get()
+            if self.jitter_ms:
+                await asyncio.sleep(random.uniform(0, self.jitter_ms) / 1000)
+            await websocket.send(message)
+            self.sent += 1
+
+    async def ping(self, websocket, pong):
+        while True:
+            await asyncio.sleep(self.ping_interval / 1000)
+            pong.clear()
+            await websocket.send('2')
+            try:
+                await asyncio.wait_for(pong.wait(), self.ping_timeout / 1000)
+            except asyncio.TimeoutError:
+                print("stand-in: ping timeout, closing client")
+                return
+
+    async def receive(self, websocket, pong):
+        async for message in websocket:
+            if message == '3':
+                pong.set()
+
+
+async def serve(args):
+    standin = FeedStandIn(SyntheticFeed(tokens=args.tokens, rate=args.rate, burst_rate=args.burst_rate),
+                          ping_interval=args.ping_interval, ping_timeout=args.ping_timeout,
+                          drop_every=args.drop_every, hang_after=args.hang_after, jitter_ms=args.jitter_ms)
+    port = await standin.start(args.host, args.port)
+    print(f"Stand-in feed on ws://{args.host}:{port}/socket.io/?EIO=4&transport=websocket")
+    started = time.monotonic()
+    while True:
+        await asyncio.sleep(10)
+        print(f"{standin.sent} frames sent, {len(standin.clients)} clients, {standin.connections} connections "
+              f"in {time.monotonic() - started:.0f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the pump.fun websocket feed")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--tokens', type=int, default=1000)
+    parser.add_argument('--rate', type=float, default=50, help="events per second outside bursts")
+    parser.add_argument('--burst-rate', type=float, default=500, help="events per second during bursts")
+    parser.add_argument('--ping-interval', type=int, default=25000, help="ms")
+    parser.add_argument('--ping-timeout', type=int, default=20000, help="ms")
+    parser.add_argument('--drop-every', type=float, help="close each connection after this many seconds")
+    parser.add_argument('--hang-after', type=float, help="go silent on each connection after this many seconds")
+    parser.add_argument('--jitter-ms', type=float, default=0, help="random per-frame delay per connection")
+    asyncio.run(serve(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+import requests
+import websockets
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import SyntheticFeed
+from bot.events import NEW_COIN_EVENT
+
+
+def percentile(samples, fraction):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))] if samples else float('nan')
+
+
+class Client:
+    # Minimal Engine.IO v4 websocket client: joins the default namespace, answers pings, counts messages
+    def __init__(self, url):
+        self.url = url
+        self.connect_time = None
+        self.messages = 0
+        self.error = None
+
+    async def run(self, ready):
+        started = time.perf_counter()
+        try:
+            async with websockets.connect(self.url, max_size=None, open_timeout=30) as websocket:
+                async for frame in websocket:
+                    if isinstance(frame, bytes):
+                        self.messages += 1
+                    elif frame.startswith('0{'):
+                        await websocket.send('40')
+                    elif frame == '2':
+                        await websocket.send('3')
+                    elif frame.startswith('40') and self.connect_time is None:
+                        self.connect_time = time.perf_counter() - started
+                        ready.release()
+                    elif frame.startswith('42') or frame.startswith('45'):
+                        self.messages += 1
+        except Exception as e:
+            self.error = e
+            if self.connect_time is None:
+                ready.release()
+
+
+def post_batches(url, batches, latencies):
+    with requests.Session() as session:
+        for batch in batches:
+            started = time.perf_counter()
+            session.post(url + '/ingest', json=batch, timeout=30).raise_for_status()
+            latencies.append(time.perf_counter() - started)
+
+
+async def load_test(args):
+    server = None
+    if args.launch:
+        flag = '--production' if args.launch == 'production' else '--dev'
+        server = subprocess.Popen([sys.executable, 'app.py', flag, '--port', str(args.port)], cwd=ROOT,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://{args.host}:{args.port}"
+    try:
+        for _ in range(100):
+            try:
+                requests.get(url + '/api/stats', timeout=1)
+                break
+            except requests.RequestException:
+                if server and server.poll() is not None:
+                    raise SystemExit(f"app.py exited with status {server.returncode}; run it by hand to see why")
+                await asyncio.sleep(0.2)
+        else:
+            raise SystemExit(f"No dashboard answering on {url}")
+
+        # Clients connect while ingest is idle; then every client listens while ingest runs flat out
+        ws_url = f"ws://{args.host}:{args.port}/socket.io/?EIO=4&transport=websocket"
+        clients = [Client(ws_url) for _ in range(args.clients)]
+        ready = asyncio.Semaphore(0)
+        started = time.perf_counter()
+        tasks = [asyncio.create_task(client.run(ready)) for client in clients]
+        for _ in clients:
+            await ready.acquire()
+        connect_elapsed = time.perf_counter() - started
+
+        feed = SyntheticFeed(tokens=args.tokens, seed=0)
+        events = [{'type': 'new_coin' if event_type == NEW_COIN_EVENT else 'trade', 'data': data}
+                  for event_type, data in feed.events(args.events)]
+        batches = [events[i:i + args.batch_size] for i in range(0, len(events), args.batch_size)]
+        shards = [batches[i::args.posters] for i in range(args.posters)]
+        latencies = []
+        started = time.perf_counter()
+        await asyncio.gather(*(asyncio.to_thread(post_batches, url, shard, latencies) for shard in shards))
+        ingest_elapsed = time.perf_counter() - started
+        await asyncio.sleep(1)
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    connected = [client for client in clients if client.connect_time is not None]
+    connect_times = [client.connect_time for client in connected]
+    messages = [client.messages for client in connected]
+    print(f"Clients: {len(connected)}/{len(clients)} connected in {connect_elapsed:.2f}s, "
+          f"connect p50 {percentile(connect_times, 0.5) * 1000:.1f}ms p99 {percentile(connect_times, 0.99) * 1000:.1f}ms")
+    errors = [client.error for client in clients if client.error]
+    if errors:
+        print(f"Client errors: {len(errors)} (first: {errors[0]!r})")
+    print(f"Ingest: {len(events)} events in {ingest_elapsed:.2f}s ({len(events) / ingest_elapsed:.0f} events/s), "
+          f"POST p50 {percentile(latencies, 0.5) * 1000:.1f}ms p99 {percentile(latencies, 0.99) * 1000:.1f}ms")
+    if messages:
+        print(f"Messages per client: min {min(messages)}, median {percentile(messages, 0.5)}, max {max(messages)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the dashboard with many Socket.IO clients and ingest POSTs")
+    parser.add_argument('--launch', choices=['dev', 'production'],
+                        help="start app.py in this mode (otherwise test a server that is already running)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--clients', type=int, default=500)
+    parser.add_argument('--events', type=int, default=50000)
+    parser.add_argument('--tokens', type=int, default=1000)
+    parser.add_argument('--batch-size', type=int, default=200)
+    parser.add_argument('--posters', type=int, default=4, help="concurrent ingest connections")
+    asyncio.run(load_test(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
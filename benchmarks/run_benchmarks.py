@@ -0,0 +1,216 @@
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.feed_standin import FeedStandIn
+from benchmarks.synthetic import SyntheticFeed
+from bot.ai_strategy import AIStrategy
+from bot.trading_bot import TradingBot
+
+SIZES = (1000, 10000, 100000)  # Token universes every target runs against
+TARGETS = ('process_new_coin', 'process_trade', 'select_token', 'execute_trade', 'get_portfolio',
+           'save_market_data', 'app_trade', 'app_stats', 'feed')
+
+
+def report(target, tokens, samples):
+    # samples are per-call durations in seconds
+    samples = sorted(samples)
+    total = sum(samples)
+    p50 = samples[len(samples) // 2]
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    print(f"{target:<18} {tokens:>8} {len(samples):>8} {len(samples) / total if total else 0:>14,.0f} "
+          f"{p50 * 1e6:>12.1f} {p99 * 1e6:>12.1f}")
+
+
+def timed(function, arguments):
+    samples = []
+    for argument in arguments:
+        started = time.perf_counter()
+        function(argument)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+async def timed_async(function, count):
+    samples = []
+    for _ in range(count):
+        started = time.perf_counter()
+        await function()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def populated_strategy(tokens, seed=0):
+    # A strategy already tracking `tokens` tokens, and the feed that created them
+    feed = SyntheticFeed(tokens=tokens, seed=seed)
+    strategy = AIStrategy(max_tokens=tokens, verbose=False)
+    for coin in feed.populate(tokens):
+        strategy.process_new_coin(coin)
+    return strategy, feed
+
+
+def trades(feed, count):
+    return [trade for trade in (feed.trade() for _ in range(count)) if trade]
+
+
+def bench_strategy(target, tokens, iterations):
+    strategy, feed = populated_strategy(tokens)
+    if target == 'process_new_coin':
+        # New coins past max_tokens also pay for evicting the oldest token
+        return timed(strategy.process_new_coin, feed.populate(iterations))
+    return timed(strategy.process_trade, trades(feed, iterations))
+
+
+def bench_select_token(tokens, iterations):
+    strategy, feed = populated_strategy(tokens)
+    return asyncio.run(timed_async(strategy.select_token, iterations))
+
+
+def bench_execute_trade(tokens, iterations):
+    strategy, feed = populated_strategy(tokens)
+    bot = TradingBot(strategy, journal_dir=None)
+    bot.initial_balance = bot.balance = float('inf')  # Never run out of cash mid-benchmark
+    return asyncio.run(timed_async(bot.execute_trade, iterations))
+
+
+def bot_with_positions(tokens):
+    # Every tracked token held, so portfolio work scales with the universe
+    strategy, feed = populated_strategy(tokens)
+    bot = TradingBot(strategy, journal_dir=None)
+    for mint in strategy.tokens_data:
+        bot.update_portfolio(mint, 1.0, 'buy', 1.0, bot.get_last_price(mint))
+    return bot, feed
+
+
+def bench_get_portfolio(tokens, iterations):
+    bot, feed = bot_with_positions(tokens)
+    samples = []
+    for trade in trades(feed, iterations):
+        bot.strategy.process_trade(trade)
+        started = time.perf_counter()
+        bot.get_portfolio()
+        bot.get_profit_loss()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def bench_save_market_data(tokens, iterations):
+    bot, feed = bot_with_positions(tokens)
+    return timed(lambda _: bot.save_market_data(), range(iterations))
+
+
+def load_app():
+    # app.py keeps its dashboard state at module level
+    import app
+    return app
+
+
+def app_events(tokens, trade_count, seed=0):
+    feed = SyntheticFeed(tokens=tokens, seed=seed)
+    coins = [{'type': 'new_coin', 'data': coin} for coin in feed.populate(tokens)]
+    return coins, [{'type': 'trade', 'data': trade} for trade in trades(feed, trade_count)]
+
+
+def bench_app_trade(app, tokens, iterations):
+    coins, trade_events = app_events(tokens, iterations)
+    app.ingest_events(coins)
+    client = app.app.test_client()
+    return timed(lambda event: client.post('/trade', json=event['data']), trade_events)
+
+
+def bench_app_stats(app, tokens, iterations):
+    coins, trade_events = app_events(tokens, tokens)
+    app.ingest_events(coins)
+    app.ingest_events(trade_events)
+    client = app.app.test_client()
+
+    def render(_):
+        # Force a rebuild each time: this measures the render, not the cache
+        app.stats_cache['version'] = None
+        app.stats_cache['built'] = float('-inf')
+        client.get('/api/stats')
+
+    return timed(render, range(iterations))
+
+
+async def bench_feed(tokens, seconds, rate):
+    # End to end over a local websocket: stand-in feed -> FeedConnection -> decoder -> handlers
+    feed = SyntheticFeed(tokens=tokens, rate=rate, burst_rate=rate * 5)
+    standin = FeedStandIn(feed)
+    port = await standin.start()
+    strategy = AIStrategy(max_tokens=tokens, verbose=False,
+                          ws_urls=[f"ws://127.0.0.1:{port}/socket.io/?EIO=4&transport=websocket"])
+    for coin in feed.populate(tokens):
+        strategy.process_new_coin(coin)
+    samples = []
+    process_trade, process_new_coin = strategy.process_trade, strategy.process_new_coin
+
+    def timed_handler(handler):
+        def run(data):
+            started = time.perf_counter()
+            handler(data)
+            samples.append(time.perf_counter() - started)
+        return run
+
+    strategy.process_trade, strategy.process_new_coin = timed_handler(process_trade), timed_handler(process_new_coin)
+    sent = standin.sent
+    strategy.start_websocket()
+    await asyncio.sleep(seconds)
+    strategy.stop_websocket()
+    await standin.stop()
+    print(f"{'feed':<18} {tokens:>8} stand-in sent {standin.sent - sent} frames, handled {len(samples)} "
+          f"({len(samples) / seconds:,.0f} events/s)")
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the bot and dashboard hot paths on synthetic pump.fun load")
+    parser.add_argument('--sizes', default=','.join(map(str, SIZES)), help="comma separated token counts")
+    parser.add_argument('--targets', default=','.join(TARGETS), help=f"comma separated subset of: {', '.join(TARGETS)}")
+    parser.add_argument('--iterations', type=int, default=2000, help="calls per target for the cheap targets")
+    parser.add_argument('--slow-iterations', type=int, default=5, help="calls for save_market_data and app_stats")
+    parser.add_argument('--feed-seconds', type=float, default=5)
+    parser.add_argument('--feed-rate', type=float, default=1000, help="stand-in events per second outside bursts")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    targets = args.targets.split(',')
+    unknown = set(targets) - set(TARGETS)
+    if unknown:
+        raise SystemExit(f"Unknown targets: {', '.join(sorted(unknown))}")
+
+    # save_market_data and app.py write files to the working directory
+    workdir = tempfile.mkdtemp(prefix='pumpedup-bench-')
+    os.chdir(workdir)
+    app = load_app() if {'app_trade', 'app_stats'} & set(targets) else None
+    print(f"Scratch files in {workdir}")
+    print(f"{'target':<18} {'tokens':>8} {'calls':>8} {'calls/s':>14} {'p50 us':>12} {'p99 us':>12}")
+    for tokens in sizes:
+        for target in targets:
+            if target in ('process_new_coin', 'process_trade'):
+                samples = bench_strategy(target, tokens, args.iterations)
+            elif target == 'select_token':
+                samples = bench_select_token(tokens, args.iterations)
+            elif target == 'execute_trade':
+                samples = bench_execute_trade(tokens, args.iterations)
+            elif target == 'get_portfolio':
+                samples = bench_get_portfolio(tokens, args.iterations)
+            elif target == 'save_market_data':
+                samples = bench_save_market_data(tokens, args.slow_iterations)
+            elif target == 'app_trade':
+                samples = bench_app_trade(app, tokens, args.iterations)
+            elif target == 'app_stats':
+                samples = bench_app_stats(app, tokens, args.slow_iterations)
+            else:
+                samples = asyncio.run(bench_feed(tokens, args.feed_seconds, args.feed_rate))
+            if samples:
+                report(target, tokens, samples)
+
+
+if __name__ == '__main__':
+    main()
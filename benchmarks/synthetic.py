@@ -0,0 +1,115 @@
+import json
+import random
+import string
+import time
+
+SOL_USD = 140.7  # USD price of SOL used for usd_market_cap
+LAMPORTS = 10 ** 9
+TOKEN_DECIMALS = 10 ** 6
+TOTAL_SUPPLY = 10 ** 9 * TOKEN_DECIMALS
+INITIAL_VIRTUAL_SOL = 30 * LAMPORTS
+INITIAL_VIRTUAL_TOKENS = 1_073_000_000 * TOKEN_DECIMALS
+
+
+def random_address(rng, suffix=''):
+    alphabet = string.ascii_letters + string.digits
+    return ''.join(rng.choice(alphabet) for _ in range(44 - len(suffix))) + suffix
+
+
+class SyntheticFeed:
+    # Generates pump.fun shaped newCoinCreated / tradeCreated payloads on a constant-product
+    # bonding curve. Trades favour recently created tokens and arrive in bursts: the rate
+    # switches between rate and burst_rate events per second.
+    def __init__(self, tokens=1000, seed=0, start_ms=None, rate=50, burst_rate=500, burst_probability=0.05,
+                 coin_ratio=0.05):
+        self.rng = random.Random(seed)
+        self.max_tokens = tokens
+        self.now_ms = start_ms if start_ms is not None else int(time.time() * 1000)
+        self.rate = rate
+        self.burst_rate = burst_rate
+        self.burst_probability = burst_probability
+        self.coin_ratio = coin_ratio
+        self.bursting = False
+        self.tokens = []  # [mint, symbol, name, creator, virtual_sol_reserves, virtual_token_reserves]
+        self.sequence = 0
+
+    def new_coin(self):
+        rng = self.rng
+        self.sequence += 1
+        mint = random_address(rng, 'pump')
+        symbol = ''.join(rng.choice(string.ascii_uppercase) for _ in range(rng.randint(3, 6)))
+        name = f"{symbol.title()} {rng.choice(['Inu', 'Cat', 'Frog', 'Coin', 'AI', 'Moon'])}"
+        creator = random_address(rng)
+        token = [mint, symbol, name, creator, INITIAL_VIRTUAL_SOL, INITIAL_VIRTUAL_TOKENS]
+        self.tokens.append(token)
+        if len(self.tokens) > self.max_tokens:
+            self.tokens.pop(rng.randrange(len(self.tokens) // 2))
+        market_cap = self.market_cap(token)
+        return {
+            'mint': mint, 'name': name, 'symbol': symbol,
+            'description': ' '.join(rng.choice(['to', 'the', 'moon', 'gm', 'wagmi', 'based']) for _ in range(rng.randint(5, 40))),
+            'image_uri': f"https://cf-ipfs.com/ipfs/Qm{random_address(rng)}",
+            'metadata_uri': f"https://cf-ipfs.com/ipfs/Qm{random_address(rng)}",
+            'twitter': None, 'telegram': None, 'website': None,
+            'bonding_curve': random_address(rng), 'associated_bonding_curve': random_address(rng),
+            'creator': creator, 'created_timestamp': self.now_ms, 'raydium_pool': None, 'complete': False,
+            'virtual_sol_reserves': token[4], 'virtual_token_reserves': token[5], 'total_supply': TOTAL_SUPPLY,
+            'show_name': True, 'king_of_the_hill_timestamp': None, 'market_cap': market_cap, 'reply_count': 0,
+            'last_reply': None, 'nsfw': False, 'market_id': None, 'inverted': None, 'username': None,
+            'profile_image': None, 'usd_market_cap': market_cap * SOL_USD,
+        }
+
+    def trade(self):
+        rng = self.rng
+        if not self.tokens:
+            return None
+        # Newer tokens trade more: pick from the most recent part of the list most of the time
+        index = len(self.tokens) - 1 - min(int(rng.expovariate(1 / 20)), len(self.tokens) - 1)
+        token = self.tokens[index]
+        mint, symbol, name, creator, virtual_sol, virtual_tokens = token
+        is_buy = rng.random() < 0.55
+        if is_buy:
+            sol_amount = int(rng.lognormvariate(18.5, 1.2))
+            new_sol = virtual_sol + sol_amount
+            new_tokens = virtual_sol * virtual_tokens // new_sol
+            token_amount = virtual_tokens - new_tokens
+        else:
+            token_amount = int(min(virtual_tokens * 0.01, rng.lognormvariate(24, 1.5)))
+            new_tokens = virtual_tokens + token_amount
+            new_sol = virtual_sol * virtual_tokens // new_tokens
+            sol_amount = virtual_sol - new_sol
+        token[4], token[5] = new_sol, new_tokens
+        market_cap = self.market_cap(token)
+        self.sequence += 1
+        return {
+            'signature': random_address(rng) + random_address(rng), 'mint': mint, 'sol_amount': sol_amount,
+            'token_amount': token_amount, 'is_buy': is_buy, 'user': random_address(rng),
+            'timestamp': self.now_ms // 1000, 'name': name, 'symbol': symbol, 'creator': creator,
+            'image_uri': f"https://cf-ipfs.com/ipfs/Qm{mint[:40]}", 'complete': False,
+            'virtual_sol_reserves': new_sol, 'virtual_token_reserves': new_tokens, 'total_supply': TOTAL_SUPPLY,
+            'market_cap': market_cap, 'usd_market_cap': market_cap * SOL_USD, 'username': None, 'profile_image': None,
+        }
+
+    def market_cap(self, token):
+        # Market cap in SOL: price per whole token times the whole-token supply
+        return token[4] / LAMPORTS / (token[5] / TOKEN_DECIMALS) * (TOTAL_SUPPLY / TOKEN_DECIMALS)
+
+    def next_event(self):
+        if self.rng.random() < self.burst_probability:
+            self.bursting = not self.bursting
+        self.now_ms += int(self.rng.expovariate(self.burst_rate if self.bursting else self.rate) * 1000)
+        if not self.tokens or self.rng.random() < self.coin_ratio:
+            return 'newCoinCreated', self.new_coin()
+        return 'tradeCreated', self.trade()
+
+    def events(self, count):
+        for _ in range(count):
+            yield self.next_event()
+
+    def populate(self, tokens):
+        # Creates tokens up front so benchmarks start from a full universe
+        return [self.new_coin() for _ in range(tokens)]
+
+
+def frame(event_type, data):
+    return '42' + json.dumps([event_type, data])
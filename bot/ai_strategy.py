@@ -1,73 +1,209 @@
 import asyncio
-import requests
-import json
-import websockets
+import time
 from datetime import datetime
 from collections import deque
+from dataclasses import dataclass
+from .analytics import RollingAnalytics
+from .decoder import FrameDecoder
+from .dedup import ExpiringSet
+from .events import NEW_COIN_EVENT, TRADE_EVENT, coin_time_ms, trade_time_ms
+from .feed import FeedConnection
+from .metrics import registry
+from .ranking import RankingIndex
+from .records import DisplayStore, TokenRecord, TradeRecord
+from .token_arrays import ACTIONS, TokenArrays
+from .token_store import TokenStore
 
+WS_URL = "wss://frontend-api.pump.fun/socket.io/?EIO=4&transport=websocket"
 MAX_TOKENS = 100  # Maximum number of tokens to keep in memory
+TOKEN_IDLE_TIMEOUT_MS = None  # Evict tokens without trades for this long (None evicts by age only)
 MAX_TRADES = 1000  # Maximum number of trades to keep in memory
 MAX_NEW_COINS = 100  # Maximum number of new coins to keep in memory
+FRAME_BATCH_SIZE = 256  # Maximum number of websocket frames decoded together
+
+EVENTS = registry.counter('pumpedup_events_total', "Feed events handled", ('type',))
+EVENT_ERRORS = registry.counter('pumpedup_event_errors_total', "Feed events whose handler raised", ('type',))
+HANDLER_SECONDS = registry.histogram('pumpedup_handler_seconds', "process_new_coin / process_trade run time", ('type',))
+FEED_LAG_SECONDS = registry.histogram('pumpedup_feed_lag_seconds',
+                                      "Event timestamp to handling (trade timestamps have 1 s resolution)", ('type',))
+
+
+@dataclass
+class StrategyParams:
+    max_age_ms: float = 300000  # Only buy tokens younger than this (5 minutes)
+    max_buy_market_cap: float = 10000  # Only buy tokens below this USD market cap
+    max_buy_usd: float = 100  # Largest buy in USD
+    buy_fraction: float = 0.01  # Buy size as a fraction of the market cap
+    min_sell_market_cap: float = 50000  # Only sell tokens above this USD market cap
+    sell_multiple: float = 5  # ... that grew at least this many times since creation
+    sell_fraction: float = 0.5  # Fraction of holdings sold
 
 class AIStrategy:
-    def __init__(self):
-        self.ws_url = "wss://frontend-api.pump.fun/socket.io/?EIO=4&transport=websocket"
-        self.tokens_data = {}
+    def __init__(self, publisher=None, tick_store=None, max_tokens=MAX_TOKENS, token_idle_timeout_ms=TOKEN_IDLE_TIMEOUT_MS,
+                 clock=time.time, verbose=True, params=None, ws_urls=None, feed_connections=1, recorder=None):
+        # Several connections (to the same or different URLs) race each other; the first copy of an event wins
+        self.ws_urls = ws_urls or [WS_URL]
+        self.feed_connections = max(feed_connections, len(self.ws_urls))
+        self.max_tokens = max_tokens
+        self.token_idle_timeout_ms = token_idle_timeout_ms
+        self.clock = clock  # Returns the current time in seconds; replaced by a simulated clock in backtests
+        self.verbose = verbose
+        self.params = params or StrategyParams()
+        self.tokens_data = TokenStore()
+        self.ranking = RankingIndex()
+        self.analytics = RollingAnalytics()
+        self.token_arrays = TokenArrays()
         self.trades = deque(maxlen=MAX_TRADES)
         self.new_coins = deque(maxlen=MAX_NEW_COINS)
+        self.display = DisplayStore(max_tokens)
         self.websocket_task = None
+        self.decoder = FrameDecoder()
+        self.feeds = []
+        self.seen_events = ExpiringSet()
+        self.publisher = publisher
+        self.tick_store = tick_store
+        self.recorder = recorder  # FeedRecorder capturing the raw frames the bot processes
+        self.listeners = []
 
     async def connect_websocket(self):
+        frames = asyncio.Queue()
+        self.feeds = [FeedConnection(self.ws_urls[i % len(self.ws_urls)], frames, name=f'feed-{i}')
+                      for i in range(self.feed_connections)]
+        feed_tasks = [asyncio.create_task(feed.run()) for feed in self.feeds]
+        try:
+            await self.handle_frames(frames)
+        finally:
+            for task in feed_tasks:
+                task.cancel()
+
+    async def handle_frames(self, frames):
+        # Frames that arrive in a burst pile up in the queue and are decoded together
         while True:
-            try:
-                async with websockets.connect(self.ws_url) as websocket:
-                    await websocket.send("40")
-                    while True:
-                        try:
-                            message = await websocket.recv()
-                            if message.startswith("42"):
-                                data = json.loads(message[2:])
-                                event_type = data[0]
-                                event_data = data[1]
-
-                                if event_type == "newCoinCreated":
-                                    self.process_new_coin(event_data)
-                                elif event_type == "tradeCreated":
-                                    self.process_trade(event_data)
-                        except websockets.exceptions.ConnectionClosed:
-                            print("WebSocket connection closed. Reconnecting...")
-                            break
-            except Exception as e:
-                print(f"Error in WebSocket connection: {e}. Retrying in 5 seconds...")
-                await asyncio.sleep(5)
+            batch = [await frames.get()]
+            while len(batch) < FRAME_BATCH_SIZE and not frames.empty():
+                batch.append(frames.get_nowait())
+            if len(self.feeds) > 1:
+                batch = self.deduplicate(batch)
+            if self.recorder:
+                for frame, received, feed in batch:
+                    self.recorder.record(frame, received)
+            for event_type, event_data in self.decoder.decode_batch([frame for frame, received, feed in batch]):
+                self.dispatch(event_type, event_data)
+
+    def deduplicate(self, batch):
+        # Later copies of an event are dropped before parsing; their delay is the connection's lag
+        fresh = []
+        for item in batch:
+            frame, received, feed = item
+            event_id = self.decoder.event_id(frame)
+            first_seen = self.seen_events.add(event_id, received) if event_id else None
+            if first_seen is None:
+                feed.first += 1
+                fresh.append(item)
+            else:
+                feed.record_duplicate(received - first_seen)
+        return fresh
+
+    def dispatch(self, event_type, event_data):
+        started = time.perf_counter()
+        try:
+            if event_type == NEW_COIN_EVENT:
+                event_ms = coin_time_ms(event_data)
+                self.process_new_coin(event_data)
+            elif event_type == TRADE_EVENT:
+                event_ms = trade_time_ms(event_data)
+                self.process_trade(event_data)
+            else:
+                return
+        except Exception as e:
+            EVENT_ERRORS.inc(event_type)
+            print(f"Error processing {event_type}: {e}")
+            return
+        EVENTS.inc(event_type)
+        HANDLER_SECONDS.observe(time.perf_counter() - started, event_type)
+        if event_ms:
+            FEED_LAG_SECONDS.observe(max(0.0, self.clock() - event_ms / 1000), event_type)
 
     def process_new_coin(self, coin_data):
-        self.new_coins.append(coin_data)
-        self.tokens_data[coin_data['mint']] = coin_data
-        if len(self.tokens_data) > MAX_TOKENS:
-            oldest_mint = min(self.tokens_data, key=lambda x: self.tokens_data[x]['created_timestamp'])
-            del self.tokens_data[oldest_mint]
-        requests.post(f"http://0.0.0.0:5000/new_coin", json=coin_data)
-        print(f"New coin created: {coin_data['name']} ({coin_data['symbol']}), Mint: https://pump.fun/{coin_data['mint']}")
+        # Keep only the fields the bot reads; display-only fields go to the side store
+        token = TokenRecord(coin_data)
+        self.new_coins.append(token)
+        self.tokens_data.add(token)
+        self.display.add(coin_data)
+        self.rank_token(token)
+        self.token_arrays.update(token.mint, token)
+        self.evict_tokens(coin_time_ms(coin_data))
+        if self.tick_store:
+            self.tick_store.append_coin(coin_data)
+        if self.publisher:
+            self.publisher.publish('new_coin', coin_data)
+        self.notify(coin_data['mint'])
+        if self.verbose:
+            print(f"New coin created: {coin_data['name']} ({coin_data['symbol']}), Mint: https://pump.fun/{coin_data['mint']}")
 
     def process_trade(self, trade_data):
-        self.trades.append(trade_data)
+        self.trades.append(TradeRecord(trade_data))
         if trade_data['mint'] in self.tokens_data:
-            self.tokens_data[trade_data['mint']].update({
+            updates = {
                 'last_trade_timestamp': trade_data['timestamp'],
                 'market_cap': trade_data['market_cap'],
                 'usd_market_cap': trade_data['usd_market_cap']
-            })
-        requests.post(f"http://0.0.0.0:5000/trade", json=trade_data)
+            }
+            # Reserves after the trade give the token's current price
+            if trade_data.get('virtual_token_reserves'):
+                updates['virtual_sol_reserves'] = trade_data['virtual_sol_reserves']
+                updates['virtual_token_reserves'] = trade_data['virtual_token_reserves']
+            self.tokens_data[trade_data['mint']].update(updates)
+            self.tokens_data.touch(trade_data['mint'], trade_time_ms(trade_data))
+            self.rank_token(self.tokens_data[trade_data['mint']])
+            self.token_arrays.update(trade_data['mint'], updates)
+            self.analytics.record_trade(trade_data)
+            self.notify(trade_data['mint'])
+        self.evict_tokens(trade_time_ms(trade_data))
+        if self.tick_store:
+            self.tick_store.append_trade(trade_data)
+        if self.publisher:
+            self.publisher.publish('trade', trade_data)
         # print(f"Trade executed: {'Buy' if trade_data['is_buy'] else 'Sell'} {trade_data['token_amount']} {trade_data['symbol']} for {trade_data['sol_amount'] / 1e9:.6f} SOL")
 
+    def add_listener(self, callback):
+        # callback(mint) is called whenever a feed event changes a token's signal inputs
+        self.listeners.append(callback)
+
+    def notify(self, mint):
+        for callback in self.listeners:
+            callback(mint)
+
+    def evict_tokens(self, now_ms):
+        while len(self.tokens_data) > self.max_tokens:
+            mint = self.tokens_data.evict_oldest()
+            if mint is None:
+                break
+            self.forget_token(mint)
+        if self.token_idle_timeout_ms is not None:
+            for mint in self.tokens_data.evict_inactive(now_ms - self.token_idle_timeout_ms):
+                self.forget_token(mint)
+
+    def rank_token(self, token_data):
+        # Strategy: Rank the newest tokens first, then by highest USD market cap
+        self.ranking.update(token_data['mint'], (token_data.get('created_timestamp') or 0, float(token_data.get('usd_market_cap') or 0)))
+
+    def forget_token(self, mint):
+        self.ranking.remove(mint)
+        self.analytics.remove(mint)
+        self.token_arrays.remove(mint)
+        self.display.remove(mint)
+
+    def token_analytics(self, mint):
+        # Rolling 1m/5m/15m volume, buy/sell counts, VWAP and price change for a tracked token
+        return self.analytics.stats(mint)
+
     async def select_token(self):
-        if not self.tokens_data:
-            return None
-        
-        # Strategy: Select the newest token with the highest USD market cap
-        best_token = max(self.tokens_data.values(), key=lambda x: (x.get('created_timestamp', 0), x.get('usd_market_cap', 0)))
-        return best_token['mint']
+        candidates = await self.select_tokens(1)
+        return candidates[0] if candidates else None
+
+    async def select_tokens(self, k):
+        return self.ranking.top(k)
 
     async def generate_trade_signal(self, symbol):
         if symbol not in self.tokens_data:
@@ -76,17 +212,26 @@ class AIStrategy:
         token_data = self.tokens_data[symbol]
         usd_market_cap = float(token_data.get('usd_market_cap', 0))
         created_timestamp = token_data.get('created_timestamp', 0)
-        current_time = datetime.now().timestamp() * 1000  # Convert to milliseconds
-
-        # Strategy: Buy if the token is new (less than 5 minutes old) and has a low market cap
-        if (current_time - created_timestamp) < 300000 and usd_market_cap < 10000:
-            return 'buy', min(100, usd_market_cap * 0.01)  # Buy up to $100 worth or 1% of market cap, whichever is less
-        # Sell if the market cap has increased significantly (e.g., 5x) since creation
-        elif usd_market_cap > 50000 and usd_market_cap > (token_data.get('initial_usd_market_cap', 0) * 5):
-            return 'sell', token_data.get('token_amount', 0) * 0.5  # Sell 50% of holdings
+        current_time = self.clock() * 1000  # Convert to milliseconds
+        params = self.params
+
+        # Strategy: Buy if the token is new (younger than params.max_age_ms) and has a low market cap
+        if (current_time - created_timestamp) < params.max_age_ms and usd_market_cap < params.max_buy_market_cap:
+            return 'buy', min(params.max_buy_usd, usd_market_cap * params.buy_fraction)  # params.max_buy_usd or params.buy_fraction of the market cap, whichever is less
+        # Sell if the market cap has grown params.sell_multiple times since creation
+        elif usd_market_cap > params.min_sell_market_cap and usd_market_cap > (token_data.get('initial_usd_market_cap', 0) * params.sell_multiple):
+            return 'sell', token_data.get('token_amount', 0) * params.sell_fraction  # Sell params.sell_fraction of holdings
         else:
             return 'hold', 0
 
+    async def generate_trade_signals(self, limit=None):
+        # Same rules as generate_trade_signal, evaluated for every tracked token at once.
+        # Returns [(mint, action, amount)] for tokens that should be traded, best candidates first.
+        mints, actions, amounts = self.token_arrays.evaluate(self.params, self.clock() * 1000)
+        if limit is not None:
+            mints, actions, amounts = mints[:limit], actions[:limit], amounts[:limit]
+        return [(mint, ACTIONS[action], float(amount)) for mint, action, amount in zip(mints, actions.tolist(), amounts)]
+
     async def generate_market_insights(self):
         if not self.tokens_data:
             return "No market data available yet."
@@ -108,13 +253,35 @@ class AIStrategy:
             latest_trade = self.trades[-1]
             insights += f"Latest trade: {'Buy' if latest_trade['is_buy'] else 'Sell'} {latest_trade['token_amount']} {latest_trade['symbol']} for {latest_trade['sol_amount'] / 1e9:.6f} SOL\n"
 
+        active = [(mint, self.token_analytics(mint)) for mint in self.analytics.tokens]
+        active = sorted((item for item in active if item[1]['5m']['volume_sol'] > 0), key=lambda item: item[1]['5m']['volume_sol'], reverse=True)[:3]
+        for mint, stats in active:
+            window = stats['5m']
+            change = f"{window['price_change'] * 100:+.1f}%" if window['price_change'] is not None else "n/a"
+            insights += f"Active (5m): {self.tokens_data[mint].get('symbol', mint)} {window['volume_sol']:.2f} SOL, {window['buys']} buys / {window['sells']} sells, price {change}\n"
+
+        for feed in self.feeds:
+            stats = feed.stats()
+            gap = f", last gap {stats['last_gap']:.2f}s (max {stats['max_gap']:.2f}s)" if stats['last_gap'] is not None else ""
+            lag = f", lag p50 {stats['lag_p50'] * 1000:.1f}ms p99 {stats['lag_p99'] * 1000:.1f}ms" if stats['lag_p50'] is not None else ""
+            insights += (f"Feed {stats['name']}: {'connected' if stats['connected'] else 'disconnected'}, {stats['connects']} connects, "
+                         f"{stats['stale_disconnects']} stale, {stats['first']} first / {stats['duplicates']} duplicate events{lag}{gap}\n")
+
+        if self.publisher:
+            stats = self.publisher.stats()
+            insights += f"Dashboard events: {stats['queued']} queued, {stats['sent']} sent, {stats['dropped']} dropped\n"
+
         return insights
 
     def start_websocket(self):
+        if self.publisher:
+            self.publisher.start()
         if self.websocket_task is None or self.websocket_task.done():
             self.websocket_task = asyncio.create_task(self.connect_websocket())
 
     def stop_websocket(self):
         if self.websocket_task:
             self.websocket_task.cancel()
-            self.websocket_task = None
\ No newline at end of file
+            self.websocket_task = None
+        if self.publisher:
+            self.publisher.stop()
\ No newline at end of file
@@ -0,0 +1,137 @@
+from array import array
+from .events import trade_time_ms
+
+# Window name -> (length, bucket) in seconds; longer windows use coarser buckets so every
+# ring stays a dozen slots or so
+WINDOWS = {'1m': (60, 5), '5m': (300, 30), '15m': (900, 90)}
+FIELDS = 5  # Per-bucket values kept for every window
+SOL, TOKENS, BUYS, SELLS, CLOSE = range(FIELDS)
+SUMS = 4  # Running sol, tokens, buys and sells per window
+
+
+class Window:
+    # Where one window's rings and running sums live inside TokenWindows.values
+    __slots__ = ('name', 'bucket_ms', 'buckets', 'slots', 'base', 'sums')
+
+    def __init__(self, name, length, bucket, base):
+        self.name = name
+        self.bucket_ms = bucket * 1000
+        self.buckets = length // bucket
+        # One spare slot keeps the close price of the bucket just before the window
+        self.slots = self.buckets + 1
+        self.base = base
+        self.sums = base + FIELDS * self.slots
+
+    @property
+    def size(self):
+        return FIELDS * self.slots + SUMS
+
+    def index(self, field, bucket):
+        return self.base + field * self.slots + bucket % self.slots
+
+
+class TokenWindows:
+    # Every window's per-bucket totals and running sums for one token, packed into one
+    # array. Advancing a ring subtracts the bucket that leaves the window, so a trade costs O(1).
+    __slots__ = ('head_ms', 'values', 'first_price', 'last_price')
+
+    def __init__(self, size, head_ms):
+        self.head_ms = head_ms
+        self.values = array('d', bytes(8 * size))
+        self.first_price = None
+        self.last_price = None
+
+
+class RollingAnalytics:
+    # Per-token 1m/5m/15m volume, buy/sell counts, VWAP and price change over the trade stream
+    def __init__(self, windows=WINDOWS):
+        self.windows = []
+        self.size = 0
+        for name, (length, bucket) in windows.items():
+            window = Window(name, length, bucket, self.size)
+            self.windows.append(window)
+            self.size += window.size
+        self.finest_ms = min(window.bucket_ms for window in self.windows)
+        self.tokens = {}
+        self.now_ms = 0
+
+    def record_trade(self, trade_data):
+        time_ms = int(trade_time_ms(trade_data))
+        self.now_ms = max(self.now_ms, time_ms)
+        windows = self.tokens.get(trade_data['mint'])
+        if windows is None:
+            windows = self.tokens[trade_data['mint']] = TokenWindows(self.size, time_ms)
+        self._advance(windows, time_ms)
+
+        sol_amount = float(trade_data.get('sol_amount') or 0)
+        token_amount = float(trade_data.get('token_amount') or 0)
+        is_buy = bool(trade_data.get('is_buy'))
+        virtual_token_reserves = float(trade_data.get('virtual_token_reserves') or 0)
+        price = float(trade_data.get('virtual_sol_reserves') or 0) / virtual_token_reserves if virtual_token_reserves > 0 else None
+        values = windows.values
+        for window in self.windows:
+            bucket = time_ms // window.bucket_ms
+            age = windows.head_ms // window.bucket_ms - bucket
+            if age >= window.slots:
+                continue
+            values[window.index(SOL, bucket)] += sol_amount
+            values[window.index(TOKENS, bucket)] += token_amount
+            values[window.index(BUYS if is_buy else SELLS, bucket)] += 1
+            if age < window.buckets:
+                values[window.sums + SOL] += sol_amount
+                values[window.sums + TOKENS] += token_amount
+                values[window.sums + (BUYS if is_buy else SELLS)] += 1
+            if age == 0 and price:
+                values[window.index(CLOSE, bucket)] = price
+
+        if time_ms // self.finest_ms == windows.head_ms // self.finest_ms and price:
+            windows.last_price = price
+            if windows.first_price is None:
+                windows.first_price = price
+
+    def remove(self, mint):
+        self.tokens.pop(mint, None)
+
+    def stats(self, mint):
+        windows = self.tokens.get(mint)
+        if windows is None:
+            return None
+        self._advance(windows, self.now_ms)
+        values = windows.values
+        stats = {}
+        for window in self.windows:
+            sol, tokens, buys, sells = values[window.sums:window.sums + SUMS]
+            head = windows.head_ms // window.bucket_ms
+            open_price = values[window.index(CLOSE, head - window.buckets)] or windows.first_price
+            stats[window.name] = {
+                'volume_sol': max(sol, 0.0) / 1e9,
+                'buys': int(buys),
+                'sells': int(sells),
+                'vwap': sol / tokens if tokens > 0 else None,
+                'price_change': windows.last_price / open_price - 1 if open_price and windows.last_price else None,
+            }
+        return stats
+
+    def _advance(self, windows, time_ms):
+        if time_ms <= windows.head_ms:
+            return
+        values = windows.values
+        for window in self.windows:
+            head = windows.head_ms // window.bucket_ms
+            bucket = time_ms // window.bucket_ms
+            if bucket <= head:
+                continue
+            if bucket - head >= window.slots:
+                # Every bucket expired: start over with the last known price carried forward
+                start = window.index(SOL, 0)
+                values[start:window.sums + SUMS] = array('d', bytes(8 * window.size))
+                for slot in range(window.slots):
+                    values[window.index(CLOSE, slot)] = windows.last_price or 0.0
+                continue
+            for step in range(head + 1, bucket + 1):
+                leaving = step - window.buckets
+                for field in (SOL, TOKENS, BUYS, SELLS):
+                    values[window.sums + field] -= values[window.index(field, leaving)]
+                    values[window.index(field, step)] = 0.0
+                values[window.index(CLOSE, step)] = values[window.index(CLOSE, step - 1)]
+        windows.head_ms = time_ms
@@ -0,0 +1,184 @@
+import argparse
+import asyncio
+import heapq
+import json
+import os
+import time
+from .ai_strategy import AIStrategy, MAX_TOKENS
+from .decoder import FrameDecoder
+from .events import NEW_COIN_EVENT, TRADE_EVENT, coin_time_ms, trade_time_ms
+from .recorder import RecordingReader
+from .tick_store import TickStore
+from .trading_bot import TradingBot
+
+TRADE_INTERVAL = 60  # Simulated seconds between trade attempts in poll mode, as in main.py
+
+
+class SimulatedClock:
+    # Time source for AIStrategy that only moves when replayed events say so
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance_to(self, now):
+        self.now = max(self.now, now)
+
+
+def load_events(path):
+    # Yields (event type, payload) in recorded order from a feed recording directory, a tick
+    # store (.db) or an NDJSON file of Socket.IO payloads (one '["tradeCreated", {...}]' or '42[...]' per line)
+    if os.path.isdir(path):
+        yield from load_recording(path)
+        return
+    if path.endswith('.db'):
+        yield from load_tick_store(path)
+        return
+    with open(path) as events_file:
+        for line in events_file:
+            line = line.strip()
+            if line.startswith('42'):
+                line = line[2:]
+            if line:
+                event_type, data = json.loads(line)[:2]
+                yield event_type, data
+
+
+def load_recording(path, start_ms=None, end_ms=None, batch_size=1000):
+    decoder = FrameDecoder()
+    batch = []
+    for received_ms, frame in RecordingReader(path).frames(start_ms, end_ms):
+        batch.append(frame)
+        if len(batch) >= batch_size:
+            yield from decoder.decode_batch(batch)
+            batch = []
+    yield from decoder.decode_batch(batch)
+
+
+def load_tick_store(path):
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No tick store at {path}")
+    tick_store = TickStore(path, readonly=True)
+    # Trade times only have whole seconds, so coins are merged on their second too: the
+    # tie-break then puts a coin before the trades made in the second it was created
+    coins = ((row['timestamp'] // 1000 * 1000, 0, NEW_COIN_EVENT, row) for row in tick_store.read_coins())
+    trades = ((row['timestamp'], 1, TRADE_EVENT, row) for row in tick_store.read_trades())
+    coin_mints = set()
+    early_trades = {}  # Mint -> trades replayed before any coin event for it
+    out_of_order = 0
+    for timestamp, _, event_type, row in heapq.merge(coins, trades, key=lambda event: event[:2]):
+        if event_type == NEW_COIN_EVENT:
+            row['created_timestamp'] = row.pop('timestamp')
+            coin_mints.add(row['mint'])
+            out_of_order += early_trades.pop(row['mint'], 0)
+        else:
+            row['timestamp'] //= 1000
+            if row['mint'] not in coin_mints:
+                early_trades[row['mint']] = early_trades.get(row['mint'], 0) + 1
+        yield event_type, row
+    tick_store.close()
+    if out_of_order:
+        print(f"Warning: {out_of_order} trades in {path} were replayed before their coin and ignored")
+
+
+class Backtest:
+    # Feeds recorded events through AIStrategy and TradingBot on a simulated clock.
+    # poll mode tries a trade every trade_interval simulated seconds like main.py;
+    # event mode evaluates each token as soon as a feed event touches it.
+    def __init__(self, events, mode='poll', trade_interval=TRADE_INTERVAL, max_tokens=MAX_TOKENS, params=None):
+        self.events = events
+        self.mode = mode
+        self.trade_interval = trade_interval
+        self.clock = SimulatedClock()
+        self.strategy = AIStrategy(max_tokens=max_tokens, clock=self.clock, verbose=False, params=params)
+        self.bot = TradingBot(self.strategy, journal_dir=None)
+        self.pending = {}
+        self.fills = []
+        self.peak = self.bot.initial_balance
+        self.max_drawdown = 0
+
+    async def run(self):
+        if self.mode == 'event':
+            self.strategy.add_listener(lambda mint: self.pending.setdefault(mint))
+        started = time.perf_counter()
+        next_trade = None
+        processed = 0
+        for event_type, data in self.events:
+            if event_type == NEW_COIN_EVENT:
+                self.clock.advance_to(coin_time_ms(data) / 1000)
+                self.strategy.process_new_coin(data)
+            elif event_type == TRADE_EVENT:
+                self.clock.advance_to(trade_time_ms(data) / 1000)
+                self.strategy.process_trade(data)
+            else:
+                continue
+            processed += 1
+
+            if self.mode == 'event':
+                pending, self.pending = self.pending, {}
+                for mint in pending:
+                    signal = await self.strategy.generate_trade_signal(mint)
+                    if signal[0] != 'hold':
+                        self.record(await self.bot.execute_trade_for(mint, signal))
+            else:
+                if next_trade is None:
+                    next_trade = self.clock() + self.trade_interval
+                while self.clock() >= next_trade:
+                    self.record(await self.bot.execute_trade())
+                    next_trade += self.trade_interval
+            # Holdings are re-marked by every trade event, so equity is sampled after each one
+            self.sample_equity()
+
+        self.sample_equity()
+        return self.report(processed, time.perf_counter() - started)
+
+    def record(self, result):
+        if result['status'] == 'success':
+            self.fills.append((self.clock(), result['message']))
+
+    def sample_equity(self):
+        value = self.bot.get_total_value()
+        self.peak = max(self.peak, value)
+        if self.peak > 0:
+            self.max_drawdown = max(self.max_drawdown, (self.peak - value) / self.peak * 100)
+
+    def report(self, processed, elapsed):
+        pl_amount, pl_percentage = self.bot.get_profit_loss()
+        return {
+            'events': processed,
+            'elapsed': elapsed,
+            'events_per_second': processed / elapsed if elapsed > 0 else 0,
+            'fills': len(self.fills),
+            'profit_loss': pl_amount,
+            'profit_loss_percentage': pl_percentage,
+            'max_drawdown_percentage': self.max_drawdown,
+            'final_value': self.bot.get_total_value(),
+            'portfolio': self.bot.get_portfolio(),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded pump.fun events through the trading bot")
+    parser.add_argument('events', help="feed recording directory, tick store (.db) or NDJSON file of recorded Socket.IO events")
+    parser.add_argument('--mode', choices=['poll', 'event'], default='poll')
+    parser.add_argument('--trade-interval', type=float, default=TRADE_INTERVAL,
+                        help="simulated seconds between trade attempts (poll mode)")
+    parser.add_argument('--max-tokens', type=int, default=MAX_TOKENS)
+    args = parser.parse_args()
+    if not os.path.exists(args.events):
+        parser.error(f"{args.events} does not exist")
+
+    backtest = Backtest(load_events(args.events), mode=args.mode, trade_interval=args.trade_interval, max_tokens=args.max_tokens)
+    report = asyncio.run(backtest.run())
+    print(f"Replayed {report['events']} events in {report['elapsed']:.2f}s ({report['events_per_second']:.0f} events/s)")
+    print(f"Fills: {report['fills']}")
+    print(f"Final value: ${report['final_value']:.2f}")
+    print(f"Profit/Loss: ${report['profit_loss']:.2f} ({report['profit_loss_percentage']:.2f}%)")
+    print(f"Max drawdown: {report['max_drawdown_percentage']:.2f}%")
+    for timestamp, message in backtest.fills[-10:]:
+        print(f"{time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(timestamp))} {message}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+import threading
+from collections import deque
+
+BROADCAST_TICK = 0.2  # Seconds between dashboard broadcasts
+MAX_TRADES_PER_TICK = 20  # Newest trades sent per coin per tick; older ones in the same tick are skipped
+
+
+def compact_trade(trade):
+    # [is_buy, sol_amount (lamports), trader, price in USD] - everything the dashboard shows for a trade
+    price = None
+    if trade.usd_market_cap is not None and trade.virtual_token_reserves:
+        price = float(trade.usd_market_cap) / (float(trade.virtual_token_reserves) / 1e9)
+    return [1 if trade.is_buy else 0, trade.sol_amount, trade.user, price]
+
+
+class BroadcastScheduler:
+    # Collects dashboard updates between ticks. New coins pass through as they are;
+    # trades are folded per mint into the latest market cap and a short list of
+    # compact trades, so a busy coin costs one update per tick instead of one per trade.
+    def __init__(self, max_trades=MAX_TRADES_PER_TICK):
+        self.max_trades = max_trades
+        self.lock = threading.Lock()
+        self.coins = []
+        self.updates = {}  # mint -> {'usd_market_cap': latest, 'trades': deque of compact trades}
+        self.trades = 0
+        self.ticks = 0
+
+    def add_coin(self, message):
+        with self.lock:
+            self.coins.append(message)
+
+    def add_trade(self, trade):
+        with self.lock:
+            update = self.updates.get(trade.mint)
+            if update is None:
+                update = self.updates[trade.mint] = {'usd_market_cap': None, 'trades': deque(maxlen=self.max_trades)}
+            if trade.usd_market_cap is not None:
+                update['usd_market_cap'] = trade.usd_market_cap
+            update['trades'].append(compact_trade(trade))
+            self.trades += 1
+
+    def drain(self):
+        # Returns (new coin messages, {mint: update}) collected since the last tick
+        with self.lock:
+            coins, self.coins = self.coins, []
+            updates, self.updates = self.updates, {}
+        if coins or updates:
+            self.ticks += 1
+        for update in updates.values():
+            update['trades'] = list(update['trades'])
+        return coins, updates
@@ -0,0 +1,69 @@
+import json
+import threading
+import zlib
+from collections import OrderedDict, deque
+
+DASHBOARD_MAX_COINS = 500  # Coins kept for the dashboard, least recently active evicted first
+DASHBOARD_TRADES_PER_COIN = 20  # Recent trades kept per coin
+DASHBOARD_COIN_TTL_MS = 60 * 60 * 1000  # Coins without events for this long are dropped
+
+
+class DashboardStore:
+    # Bounded dashboard state: coin messages ordered by last activity (LRU with a TTL on
+    # feed time) and the last few trades of each. New browsers get all of it as one
+    # zlib-compressed snapshot, cached until the next change.
+    def __init__(self, max_coins=DASHBOARD_MAX_COINS, trades_per_coin=DASHBOARD_TRADES_PER_COIN,
+                 ttl_ms=DASHBOARD_COIN_TTL_MS):
+        self.max_coins = max_coins
+        self.trades_per_coin = trades_per_coin
+        self.ttl_ms = ttl_ms
+        self.lock = threading.Lock()
+        self.coins = OrderedDict()  # mint -> [coin message, trades deque, last event ms]
+        self.version = 0
+        self.compressed = (None, None)  # (version, snapshot bytes)
+
+    def __len__(self):
+        return len(self.coins)
+
+    def add_coin(self, message, time_ms):
+        with self.lock:
+            self.coins.pop(message['mint'], None)
+            self.coins[message['mint']] = [message, deque(maxlen=self.trades_per_coin), time_ms]
+            self._expire(time_ms)
+            self.version += 1
+
+    def add_trade(self, trade, time_ms):
+        # Trades of coins the dashboard never saw created cannot be shown and are not kept
+        with self.lock:
+            entry = self.coins.get(trade.mint)
+            if entry is None:
+                return False
+            entry[1].append(trade)
+            entry[2] = max(entry[2], time_ms)
+            self.coins.move_to_end(trade.mint)
+            self._expire(time_ms)
+            self.version += 1
+            return True
+
+    def snapshot(self):
+        # Coins oldest first so the browser, which prepends, ends with the newest on top
+        with self.lock:
+            return {
+                'new_coins': [message for message, trades, last_ms in self.coins.values()],
+                'trades': [trade.to_dict() for message, trades, last_ms in self.coins.values() for trade in trades],
+            }
+
+    def compressed_snapshot(self):
+        version, body = self.compressed
+        if version != self.version:
+            version = self.version
+            body = zlib.compress(json.dumps(self.snapshot(), separators=(',', ':')).encode())
+            self.compressed = (version, body)
+        return body
+
+    def _expire(self, now_ms):
+        while self.coins:
+            mint, (message, trades, last_ms) = next(iter(self.coins.items()))
+            if len(self.coins) <= self.max_coins and last_ms >= now_ms - self.ttl_ms:
+                break
+            del self.coins[mint]
@@ -0,0 +1,69 @@
+import json
+import re
+from .events import NEW_COIN_EVENT, TRADE_EVENT
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_BACKENDS = {'json': json.loads}
+if orjson is not None:
+    JSON_BACKENDS['orjson'] = orjson.loads
+DEFAULT_BACKEND = 'orjson' if orjson is not None else 'json'
+EVENT_ID_FIELDS = {TRADE_EVENT: 'signature', NEW_COIN_EVENT: 'mint'}
+
+
+class FrameDecoder:
+    # Turns Socket.IO event frames ('42["tradeCreated",{...}]') into (event type, payload).
+    # The event type is matched on the raw frame first, so frames for other events and
+    # Engine.IO control frames are dropped without being parsed; for kept frames only the
+    # payload object is parsed.
+    def __init__(self, events=(NEW_COIN_EVENT, TRADE_EVENT), backend=DEFAULT_BACKEND):
+        self.loads = JSON_BACKENDS[backend]
+        self.backend = backend
+        self.events = frozenset(events)
+        self.id_patterns = {event: re.compile(rf'"{field}"\s*:\s*"([^"]+)"') for event, field in EVENT_ID_FIELDS.items()}
+        self.decoded = 0
+        self.skipped = 0
+
+    def event_id(self, frame):
+        # (event type, trade signature or coin mint) read from the raw frame, or None
+        if not isinstance(frame, str) or not frame.startswith('42["'):
+            return None
+        event = frame[4:frame.find('"', 4)]
+        pattern = self.id_patterns.get(event)
+        match = pattern.search(frame) if pattern else None
+        return (event, match.group(1)) if match else None
+
+    def decode(self, frame):
+        events = self.decode_batch((frame,))
+        return events[0] if events else None
+
+    def decode_batch(self, frames):
+        loads = self.loads
+        wanted = self.events
+        events = []
+        skipped = 0
+        for frame in frames:
+            # '42["<event>",<payload>]': read the event name without parsing the frame
+            if not isinstance(frame, str) or not frame.startswith('42["'):
+                skipped += 1
+                continue
+            end = frame.find('"', 4)
+            event = frame[4:end]
+            if event not in wanted:
+                skipped += 1
+                continue
+            try:
+                try:
+                    events.append((event, loads(frame[end + 2:-1])))
+                except ValueError:
+                    # Frames with extra arguments need the full array parsed
+                    events.append((event, loads(frame[2:])[1]))
+            except (ValueError, IndexError) as e:
+                print(f"Dropping undecodable {event} frame: {e}")
+                skipped += 1
+        self.decoded += len(events)
+        self.skipped += skipped
+        return events
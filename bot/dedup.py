@@ -0,0 +1,27 @@
+from collections import OrderedDict
+
+DEDUP_TTL = 60  # Seconds an event id is remembered
+DEDUP_MAX_SIZE = 200000  # Maximum number of remembered event ids
+
+
+class ExpiringSet:
+    # Remembers keys with the time they were first seen, forgetting them after ttl
+    # seconds or when more than maxsize keys are held (oldest first).
+    def __init__(self, ttl=DEDUP_TTL, maxsize=DEDUP_MAX_SIZE):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.seen = OrderedDict()
+
+    def __len__(self):
+        return len(self.seen)
+
+    def add(self, key, now):
+        # Returns None for a new key, otherwise the time the key was first seen
+        first_seen = self.seen.get(key)
+        if first_seen is not None:
+            return first_seen
+        self.seen[key] = now
+        cutoff = now - self.ttl
+        while self.seen and (len(self.seen) > self.maxsize or next(iter(self.seen.values())) < cutoff):
+            self.seen.popitem(last=False)
+        return None
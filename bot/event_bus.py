@@ -0,0 +1,24 @@
+import asyncio
+from .publisher import PUBLISH_BATCH_SIZE, PUBLISH_QUEUE_SIZE, EventQueue
+
+
+class EventBus(EventQueue):
+    # In-process replacement for EventPublisher: batches go straight to subscriber
+    # callables on the event loop instead of being serialized and POSTed.
+    # Subscribers get the same [{'type', 'data'}] lists as /ingest.
+    def __init__(self, maxsize=PUBLISH_QUEUE_SIZE, batch_size=PUBLISH_BATCH_SIZE):
+        super().__init__(maxsize, batch_size)
+        self.subscribers = []
+
+    def subscribe(self, handler):
+        self.subscribers.append(handler)
+
+    async def deliver(self, events):
+        for handler in self.subscribers:
+            try:
+                handler(events)
+            except Exception as e:
+                print(f"Error in event bus subscriber {handler}: {e}")
+        # Let the feed run between batches
+        await asyncio.sleep(0)
+        return True
@@ -0,0 +1,11 @@
+NEW_COIN_EVENT = "newCoinCreated"
+TRADE_EVENT = "tradeCreated"
+
+
+def coin_time_ms(coin_data):
+    return coin_data.get('created_timestamp') or 0
+
+
+def trade_time_ms(trade_data):
+    # pump.fun trade timestamps are in seconds, coin timestamps in milliseconds
+    return (trade_data.get('timestamp') or 0) * 1000
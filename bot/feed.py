@@ -0,0 +1,119 @@
+import asyncio
+import json
+import random
+import time
+from collections import deque
+import websockets
+
+RECONNECT_MIN_DELAY = 0.05  # First reconnect waits up to this many seconds
+RECONNECT_MAX_DELAY = 5  # Reconnect delays stop growing here
+DEFAULT_PING_INTERVAL = 25  # Engine.IO defaults, used until the server's handshake says otherwise
+DEFAULT_PING_TIMEOUT = 20
+MAX_GAP_SAMPLES = 100  # Number of recent connection gaps kept for reporting
+MAX_LAG_SAMPLES = 1000  # Number of recent lags behind the fastest connection kept for reporting
+
+
+class FeedConnection:
+    # Engine.IO v4 / Socket.IO client for the pump.fun feed.
+    # Answers server pings, treats the connection as stale when nothing (not even a ping)
+    # arrives within pingInterval + pingTimeout, and reconnects with jittered exponential
+    # backoff. Event frames are put on the frames queue as (frame, receive time, connection).
+    def __init__(self, url, frames, name='feed'):
+        self.url = url
+        self.frames = frames
+        self.name = name
+        self.ping_interval = DEFAULT_PING_INTERVAL
+        self.ping_timeout = DEFAULT_PING_TIMEOUT
+        self.last_frame = None
+        self.disconnected_at = None
+        self.connected = False
+        self.connects = 0
+        self.pings = 0
+        self.stale_disconnects = 0
+        self.gaps = deque(maxlen=MAX_GAP_SAMPLES)
+        self.received = 0
+        self.first = 0  # Events this connection delivered before any other
+        self.duplicates = 0
+        self.lags = deque(maxlen=MAX_LAG_SAMPLES)  # Seconds behind the connection that delivered first
+
+    async def run(self):
+        attempt = 0
+        while True:
+            try:
+                async with websockets.connect(self.url, close_timeout=1) as websocket:
+                    self.connects += 1
+                    self.connected = True
+                    attempt = 0
+                    await self.session(websocket)
+                print(f"{self.name}: connection closed. Reconnecting...")
+            except websockets.exceptions.ConnectionClosed:
+                print(f"{self.name}: connection lost. Reconnecting...")
+            except Exception as e:
+                print(f"{self.name}: error in websocket connection: {e}")
+            if self.connected:
+                self.connected = False
+                self.disconnected_at = self.last_frame or time.monotonic()
+            delay = random.uniform(0, min(RECONNECT_MAX_DELAY, RECONNECT_MIN_DELAY * 2 ** attempt))
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def session(self, websocket):
+        self.last_frame = time.monotonic()
+        watchdog = asyncio.create_task(self.watch(websocket))
+        try:
+            async for frame in websocket:
+                received = time.monotonic()
+                self.last_frame = received
+                if frame == '2':
+                    self.pings += 1
+                    await websocket.send('3')
+                elif frame.startswith('42'):
+                    if self.disconnected_at is not None:
+                        self.gaps.append(received - self.disconnected_at)
+                        print(f"{self.name}: feed resumed after a {received - self.disconnected_at:.2f}s gap")
+                        self.disconnected_at = None
+                    self.received += 1
+                    self.frames.put_nowait((frame, received, self))
+                elif frame.startswith('0{'):
+                    self.handshake(frame)
+                    await websocket.send('40')
+                elif frame.startswith('41') or frame == '1':
+                    return
+        finally:
+            watchdog.cancel()
+
+    def handshake(self, frame):
+        handshake = json.loads(frame[1:])
+        self.ping_interval = handshake.get('pingInterval', self.ping_interval * 1000) / 1000
+        self.ping_timeout = handshake.get('pingTimeout', self.ping_timeout * 1000) / 1000
+
+    async def watch(self, websocket):
+        while True:
+            await asyncio.sleep(1)
+            if time.monotonic() - self.last_frame > self.ping_interval + self.ping_timeout:
+                print(f"{self.name}: no frames for {time.monotonic() - self.last_frame:.1f}s, dropping stale connection")
+                self.stale_disconnects += 1
+                await websocket.close()
+                return
+
+    def record_duplicate(self, lag):
+        self.duplicates += 1
+        self.lags.append(lag)
+
+    def stats(self):
+        gaps = sorted(self.gaps)
+        lags = sorted(self.lags)
+        return {
+            'name': self.name,
+            'received': self.received,
+            'first': self.first,
+            'duplicates': self.duplicates,
+            'lag_p50': lags[len(lags) // 2] if lags else None,
+            'lag_p99': lags[min(len(lags) - 1, int(len(lags) * 0.99))] if lags else None,
+            'connected': self.connected,
+            'connects': self.connects,
+            'pings': self.pings,
+            'stale_disconnects': self.stale_disconnects,
+            'last_gap': self.gaps[-1] if self.gaps else None,
+            'max_gap': gaps[-1] if gaps else None,
+        }
@@ -0,0 +1,53 @@
+import queue
+import threading
+
+IO_QUEUE_SIZE = 1000  # Queued jobs beyond which droppable jobs are skipped
+
+
+class IOWorker:
+    # Runs persistence jobs (journal writes, tick store batches, snapshot files) on one
+    # writer thread, in the order they were submitted, so the event loop never waits on disk.
+    # Jobs that must not be lost are always queued, so submit never blocks the loop;
+    # droppable jobs (periodic snapshots that the next one replaces) are skipped while
+    # more than maxsize jobs are waiting.
+    def __init__(self, maxsize=IO_QUEUE_SIZE):
+        self.maxsize = maxsize
+        self.queue = queue.Queue()
+        self.completed = 0
+        self.dropped = 0
+        self.failed = 0
+        self.thread = threading.Thread(target=self.run, name='io-worker', daemon=True)
+        self.thread.start()
+
+    def submit(self, job, *args, droppable=False):
+        if droppable and self.queue.qsize() >= self.maxsize:
+            self.dropped += 1
+            return False
+        self.queue.put((job, args))
+        return True
+
+    def run(self):
+        while True:
+            job, args = self.queue.get()
+            if job is None:
+                return
+            try:
+                job(*args)
+                self.completed += 1
+            except Exception as e:
+                self.failed += 1
+                print(f"Error in background write {getattr(job, '__qualname__', job)}: {e}")
+
+    def stats(self):
+        return {
+            'queued': self.queue.qsize(),
+            'completed': self.completed,
+            'dropped': self.dropped,
+            'failed': self.failed,
+        }
+
+    def close(self, timeout=None):
+        # Everything submitted before close is written before the thread exits
+        if self.thread.is_alive():
+            self.queue.put((None, ()))
+            self.thread.join(timeout)
@@ -0,0 +1,65 @@
+import threading
+from collections import OrderedDict, deque
+from .ranking import RankingIndex
+
+STATS_WINDOW_MS = 60 * 60 * 1000  # Aggregates cover the last hour
+BUCKET_MS = 60 * 1000  # One chart point per minute
+
+
+class MarketStats:
+    # Dashboard aggregates maintained per event instead of recomputed per request:
+    # total market cap per minute, top coins by market cap and trades per minute.
+    def __init__(self, window_ms=STATS_WINDOW_MS):
+        self.window_ms = window_ms
+        self.lock = threading.Lock()
+        self.caps = OrderedDict()  # mint -> (symbol, usd_market_cap, last event ms), least recently seen first
+        self.top = RankingIndex()
+        self.total_market_cap = 0.0
+        self.total_by_minute = deque()  # (minute ms, total market cap at the end of that minute)
+        self.trades_by_minute = deque()  # (minute ms, number of trades)
+        self.version = 0
+
+    def record(self, mint, symbol, usd_market_cap, time_ms, is_trade):
+        minute = time_ms - time_ms % BUCKET_MS
+        usd_market_cap = float(usd_market_cap or 0)
+        with self.lock:
+            previous = self.caps.pop(mint, None)
+            if previous:
+                self.total_market_cap -= previous[1]
+            self.caps[mint] = (symbol, usd_market_cap, time_ms)
+            self.total_market_cap += usd_market_cap
+            self.top.update(mint, (usd_market_cap,))
+            self._expire(time_ms - self.window_ms)
+            self._bump(self.total_by_minute, minute, self.total_market_cap, replace=True)
+            if is_trade:
+                self._bump(self.trades_by_minute, minute, 1)
+            self.version += 1
+
+    def snapshot(self, top_n=5):
+        with self.lock:
+            top_coins = [(self.caps[mint][0], self.caps[mint][1]) for mint in self.top.top(top_n)]
+            return {
+                'version': self.version,
+                'total_by_minute': list(self.total_by_minute),
+                'top_coins': top_coins,
+                'trades_by_minute': list(self.trades_by_minute),
+            }
+
+    def _expire(self, cutoff_ms):
+        while self.caps:
+            mint, (symbol, usd_market_cap, last_ms) = next(iter(self.caps.items()))
+            if last_ms >= cutoff_ms:
+                break
+            del self.caps[mint]
+            self.top.remove(mint)
+            self.total_market_cap -= usd_market_cap
+        for series in (self.total_by_minute, self.trades_by_minute):
+            while series and series[0][0] < cutoff_ms - cutoff_ms % BUCKET_MS:
+                series.popleft()
+
+    def _bump(self, series, minute, value, replace=False):
+        # Events arrive roughly in time order; late events land in the newest bucket
+        if series and series[-1][0] >= minute:
+            series[-1] = (series[-1][0], value if replace else series[-1][1] + value)
+        else:
+            series.append((minute, value))
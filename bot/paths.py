@@ -0,0 +1,7 @@
+import os
+
+DATA_DIR = os.environ.get('PUMPEDUP_DATA_DIR', '.')  # Where the bot and dashboard keep their files
+
+
+def data_path(name):
+    return os.path.join(DATA_DIR, name)
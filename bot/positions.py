@@ -0,0 +1,73 @@
+class Position:
+    __slots__ = ('quantity', 'cost', 'price')
+
+    def __init__(self):
+        self.quantity = 0.0
+        self.cost = 0.0  # Cost basis of the quantity held (average cost)
+        self.price = None  # Last mark; None until a price is known
+
+    @property
+    def value(self):
+        return self.quantity * self.price if self.price else 0
+
+
+class PositionBook:
+    # Holdings with running totals: fills and price marks each adjust market_value, cost
+    # and realized PnL by the change they cause, so portfolio value and PnL are plain reads.
+    def __init__(self):
+        self.positions = {}
+        self.market_value = 0.0
+        self.cost = 0.0
+        self.realized = 0.0
+
+    def __contains__(self, mint):
+        return mint in self.positions
+
+    def __len__(self):
+        return len(self.positions)
+
+    def items(self):
+        return self.positions.items()
+
+    def quantity(self, mint):
+        position = self.positions.get(mint)
+        return position.quantity if position else 0
+
+    def buy(self, mint, quantity, cost, price=None):
+        position = self.positions.get(mint)
+        if position is None:
+            position = self.positions[mint] = Position()
+        self.market_value -= position.value
+        position.quantity += quantity
+        position.cost += cost
+        self.cost += cost
+        if price:
+            position.price = price
+        self.market_value += position.value
+
+    def sell(self, mint, quantity, revenue, price=None):
+        position = self.positions.get(mint)
+        if position is None:
+            position = self.positions[mint] = Position()
+        quantity = min(quantity, position.quantity)
+        cost = position.cost * quantity / position.quantity if position.quantity else 0
+        self.market_value -= position.value
+        position.quantity -= quantity
+        position.cost -= cost
+        self.cost -= cost
+        self.realized += revenue - cost
+        if price:
+            position.price = price
+        self.market_value += position.value
+
+    def mark(self, mint, price):
+        position = self.positions.get(mint)
+        if position is None or not price:
+            return
+        self.market_value += position.quantity * price - position.value
+        position.price = price
+
+    @property
+    def unrealized(self):
+        # Positions without a mark count at zero value, as in the portfolio listing
+        return self.market_value - self.cost
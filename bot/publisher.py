@@ -0,0 +1,87 @@
+import asyncio
+import requests
+
+DASHBOARD_URL = "http://0.0.0.0:5000"
+PUBLISH_QUEUE_SIZE = 10000  # Maximum number of events waiting to be sent to the dashboard
+PUBLISH_BATCH_SIZE = 200  # Maximum number of events sent per batch
+PUBLISH_TIMEOUT = 2  # Seconds before a dashboard request is abandoned
+PUBLISH_RETRY_DELAY = 1  # Seconds to wait after the dashboard failed to accept a batch
+
+INGEST_ROUTE = '/ingest'
+
+
+class EventQueue:
+    # Bounded queue between the strategy and a consumer of its events. publish() never
+    # blocks the websocket loop: when the consumer falls behind, the oldest queued events
+    # are dropped so it always sees the freshest data. Subclasses only implement deliver().
+    def __init__(self, maxsize=PUBLISH_QUEUE_SIZE, batch_size=PUBLISH_BATCH_SIZE):
+        self.batch_size = batch_size
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.task = None
+        self.published = 0
+        self.sent = 0
+        self.dropped = 0
+
+    def publish(self, event_type, data):
+        self.published += 1
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait((event_type, data))
+
+    def stats(self):
+        return {
+            'queued': self.queue.qsize(),
+            'published': self.published,
+            'sent': self.sent,
+            'dropped': self.dropped,
+        }
+
+    async def run(self):
+        while True:
+            batch = [await self.queue.get()]
+            while len(batch) < self.batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            events = [{'type': event_type, 'data': data} for event_type, data in batch]
+            if await self.deliver(events):
+                self.sent += len(events)
+
+    async def deliver(self, events):
+        # Hands one batch of [{'type', 'data'}] events to the consumer; True once delivered
+        raise NotImplementedError
+
+    def start(self):
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+
+    def stop(self):
+        if self.task:
+            self.task.cancel()
+            self.task = None
+
+
+class EventPublisher(EventQueue):
+    # Fans strategy events out to the dashboard process as batched POSTs to /ingest
+    def __init__(self, base_url=DASHBOARD_URL, maxsize=PUBLISH_QUEUE_SIZE, batch_size=PUBLISH_BATCH_SIZE):
+        super().__init__(maxsize, batch_size)
+        self.base_url = base_url
+        self.session = requests.Session()
+
+    async def deliver(self, events):
+        try:
+            await asyncio.to_thread(self._send_batch, events)
+            return True
+        except requests.RequestException as e:
+            self.dropped += len(events)
+            print(f"Dashboard unavailable ({e}), dropped {len(events)} events")
+            await asyncio.sleep(PUBLISH_RETRY_DELAY)
+            return False
+
+    def _send_batch(self, events):
+        # One request per batch over the session's keep-alive connection
+        response = self.session.post(self.base_url + INGEST_ROUTE, json=events, timeout=PUBLISH_TIMEOUT)
+        response.raise_for_status()
+
+    def stop(self):
+        super().stop()
+        self.session.close()
@@ -0,0 +1,42 @@
+import heapq
+
+
+class RankingIndex:
+    # Keeps mints ranked by a sortable key tuple, highest first.
+    # Updates push a new heap entry and the old one goes stale; stale entries are
+    # discarded when they reach the top, so updates and top-k reads are O(log n).
+    def __init__(self):
+        self.heap = []
+        self.keys = {}
+
+    def __len__(self):
+        return len(self.keys)
+
+    def update(self, mint, key):
+        if self.keys.get(mint) == key:
+            return
+        self.keys[mint] = key
+        heapq.heappush(self.heap, (tuple(-value for value in key), mint))
+        if len(self.heap) > 2 * len(self.keys) + 64:
+            self._compact()
+
+    def remove(self, mint):
+        self.keys.pop(mint, None)
+
+    def top(self, k=1):
+        ranked = []
+        valid = []
+        while self.heap and len(ranked) < k:
+            entry = heapq.heappop(self.heap)
+            negated_key, mint = entry
+            if mint in ranked or self.keys.get(mint) != tuple(-value for value in negated_key):
+                continue
+            ranked.append(mint)
+            valid.append(entry)
+        for entry in valid:
+            heapq.heappush(self.heap, entry)
+        return ranked
+
+    def _compact(self):
+        self.heap = [(tuple(-value for value in key), mint) for mint, key in self.keys.items()]
+        heapq.heapify(self.heap)
@@ -0,0 +1,150 @@
+import argparse
+import mmap
+import os
+import struct
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+RECORDING_DIR = 'recordings'  # Directory holding recorded feed segments
+CHUNK_FRAMES = 2000  # Frames per compressed chunk
+CHUNK_SECONDS = 5  # A partly filled chunk is written after this many seconds
+SEGMENT_MAX_BYTES = 64 * 1024 * 1024  # Start a new segment once the current one reaches this size
+COMPRESSION_LEVEL = 6
+
+FRAME_HEADER = struct.Struct('<qI')  # receive time (µs since the epoch), frame length
+INDEX_ENTRY = struct.Struct('<QIqqI')  # chunk offset, compressed length, first µs, last µs, frames
+
+
+class FeedRecorder:
+    # Records raw feed frames with their receive times into numbered segments
+    # (feed-000001.rec) of zlib-compressed chunks, with one index entry per chunk in
+    # feed-000001.idx. The receive loop only appends to a list; compression and writes
+    # happen on a single writer thread so chunks land in order.
+    def __init__(self, directory=RECORDING_DIR, chunk_frames=CHUNK_FRAMES, chunk_seconds=CHUNK_SECONDS,
+                 segment_max_bytes=SEGMENT_MAX_BYTES):
+        self.directory = directory
+        self.chunk_frames = chunk_frames
+        self.chunk_seconds = chunk_seconds
+        self.segment_max_bytes = segment_max_bytes
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='recorder')
+        self.chunk = []
+        self.chunk_started = None
+        self.segment = None
+        self.index = None
+        self.frames = 0
+        self.bytes_written = 0
+        # Frames carry time.monotonic() receive times; this turns them into wall-clock time
+        self.epoch_offset = time.time() - time.monotonic()
+        os.makedirs(directory, exist_ok=True)
+        existing = [name for name in os.listdir(directory) if name.startswith('feed-') and name.endswith('.rec')]
+        self.segment_number = len(existing)
+
+    def record(self, frame, received):
+        if not self.chunk:
+            self.chunk_started = received
+        self.chunk.append((int((received + self.epoch_offset) * 1_000_000), frame))
+        self.frames += 1
+        if len(self.chunk) >= self.chunk_frames or received - self.chunk_started >= self.chunk_seconds:
+            self.flush()
+
+    def flush(self):
+        if self.chunk:
+            chunk, self.chunk = self.chunk, []
+            self.executor.submit(self._write_chunk, chunk)
+
+    def close(self):
+        self.flush()
+        self.executor.shutdown(wait=True)
+        if self.segment:
+            self.segment.close()
+            self.index.close()
+            self.segment = None
+
+    def _write_chunk(self, chunk):
+        try:
+            parts = []
+            for micros, frame in chunk:
+                data = frame.encode()
+                parts.append(FRAME_HEADER.pack(micros, len(data)))
+                parts.append(data)
+            payload = b''.join(parts)
+            compressed = zlib.compress(payload, COMPRESSION_LEVEL)
+            if self.segment is None or self.segment.tell() >= self.segment_max_bytes:
+                self._rotate()
+            offset = self.segment.tell()
+            self.segment.write(compressed)
+            self.segment.flush()
+            # The index entry goes last, so readers never see a chunk that is not fully written
+            self.index.write(INDEX_ENTRY.pack(offset, len(compressed), chunk[0][0], chunk[-1][0], len(chunk)))
+            self.index.flush()
+            self.bytes_written += len(compressed)
+        except Exception as e:
+            print(f"Error writing feed recording: {e}")
+
+    def _rotate(self):
+        if self.segment:
+            self.segment.close()
+            self.index.close()
+        self.segment_number += 1
+        base = os.path.join(self.directory, f"feed-{self.segment_number:06d}")
+        self.segment = open(base + '.rec', 'ab')
+        self.index = open(base + '.idx', 'ab')
+
+
+class RecordingReader:
+    # Lazily yields (receive time ms, frame) from a recording directory. Only chunks whose
+    # index entry overlaps the requested time range are decompressed, straight out of a
+    # memory map of the segment.
+    def __init__(self, directory=RECORDING_DIR):
+        self.directory = directory
+
+    def segments(self):
+        names = sorted(name for name in os.listdir(self.directory) if name.startswith('feed-') and name.endswith('.rec'))
+        return [os.path.join(self.directory, name) for name in names]
+
+    def chunks(self, path):
+        with open(path[:-4] + '.idx', 'rb') as index:
+            data = index.read()
+        usable = len(data) - len(data) % INDEX_ENTRY.size
+        return list(INDEX_ENTRY.iter_unpack(data[:usable]))
+
+    def frames(self, start_ms=None, end_ms=None):
+        start = start_ms * 1000 if start_ms is not None else None
+        end = end_ms * 1000 if end_ms is not None else None
+        for path in self.segments():
+            chunks = [chunk for chunk in self.chunks(path)
+                      if (start is None or chunk[3] >= start) and (end is None or chunk[2] < end)]
+            if not chunks or os.path.getsize(path) == 0:
+                continue
+            with open(path, 'rb') as segment, mmap.mmap(segment.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                for offset, length, first, last, count in chunks:
+                    payload = zlib.decompress(view[offset:offset + length])
+                    position = 0
+                    for _ in range(count):
+                        micros, size = FRAME_HEADER.unpack_from(payload, position)
+                        position += FRAME_HEADER.size
+                        if (start is None or micros >= start) and (end is None or micros < end):
+                            yield micros / 1000, payload[position:position + size].decode()
+                        position += size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Print frames from a feed recording")
+    parser.add_argument('directory', nargs='?', default=RECORDING_DIR)
+    parser.add_argument('--start', type=float, help="only frames received at or after this Unix time (seconds)")
+    parser.add_argument('--end', type=float, help="only frames received before this Unix time (seconds)")
+    parser.add_argument('--count', action='store_true', help="print the number of frames instead of the frames")
+    args = parser.parse_args()
+
+    frames = RecordingReader(args.directory).frames(args.start * 1000 if args.start is not None else None,
+                                                    args.end * 1000 if args.end is not None else None)
+    if args.count:
+        print(sum(1 for _ in frames))
+        return
+    for received_ms, frame in frames:
+        print(f"{time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(received_ms / 1000))}.{int(received_ms % 1000):03d} {frame}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+import sys
+from collections import OrderedDict
+
+MAX_DISPLAY_ENTRIES = 1000  # Coins whose display-only fields are kept
+DISPLAY_FIELDS = ('image_uri', 'description', 'creator', 'username', 'creator_username',
+                  'twitter', 'telegram', 'website', 'reply_count')
+INTERNED_FIELDS = {'mint', 'symbol'}
+
+
+class Record:
+    # Base for compact feed records: only the named slots are kept, and the mapping-style
+    # helpers (get, [], in, update) let them stand in for the decoded JSON dicts.
+    __slots__ = ()
+
+    def __init__(self, data):
+        for name in self.__slots__:
+            value = data.get(name)
+            if name in INTERNED_FIELDS and value is not None:
+                value = sys.intern(value)
+            setattr(self, name, value)
+
+    def get(self, name, default=None):
+        value = getattr(self, name, None) if name in self.__slots__ else None
+        return default if value is None else value
+
+    def __getitem__(self, name):
+        if name not in self.__slots__:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def __contains__(self, name):
+        return name in self.__slots__ and getattr(self, name) is not None
+
+    def update(self, values):
+        for name, value in values.items():
+            if name in self.__slots__:
+                setattr(self, name, value)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__ if getattr(self, name) is not None}
+
+
+class TokenRecord(Record):
+    __slots__ = ('mint', 'name', 'symbol', 'created_timestamp', 'market_cap', 'usd_market_cap', 'initial_usd_market_cap',
+                 'virtual_sol_reserves', 'virtual_token_reserves', 'token_amount', 'last_trade_timestamp')
+
+
+class TradeRecord(Record):
+    __slots__ = ('mint', 'symbol', 'user', 'is_buy', 'sol_amount', 'token_amount', 'timestamp', 'market_cap',
+                 'usd_market_cap', 'virtual_sol_reserves', 'virtual_token_reserves')
+
+
+class DisplayStore:
+    # Side store for fields only shown to people (images, descriptions, links), bounded LRU by mint
+    def __init__(self, maxsize=MAX_DISPLAY_ENTRIES):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+
+    def add(self, coin_data):
+        self.entries[coin_data['mint']] = tuple(coin_data.get(name) for name in DISPLAY_FIELDS)
+        self.entries.move_to_end(coin_data['mint'])
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def get(self, mint):
+        values = self.entries.get(mint)
+        if values is None:
+            return {}
+        return {name: value for name, value in zip(DISPLAY_FIELDS, values) if value is not None}
+
+    def remove(self, mint):
+        self.entries.pop(mint, None)
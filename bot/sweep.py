@@ -0,0 +1,97 @@
+import argparse
+import asyncio
+import itertools
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, fields
+from .ai_strategy import MAX_TOKENS, StrategyParams
+from .backtest import TRADE_INTERVAL, Backtest, load_events
+
+# Events of the recording being swept. Loaded in the parent before the pool starts so
+# forked workers share the pages copy-on-write; spawned workers load them once each.
+worker_events = None
+worker_settings = None
+
+
+def init_worker(path, settings):
+    global worker_events, worker_settings
+    if worker_events is None:
+        worker_events = list(load_events(path))
+    worker_settings = settings
+
+
+def run_params(params):
+    backtest = Backtest(iter(worker_events), params=StrategyParams(**params), **worker_settings)
+    report = asyncio.run(backtest.run())
+    return {
+        'params': params,
+        'profit_loss': report['profit_loss'],
+        'profit_loss_percentage': report['profit_loss_percentage'],
+        'max_drawdown_percentage': report['max_drawdown_percentage'],
+        'fills': report['fills'],
+    }
+
+
+def parameter_grid(grid, samples=None, seed=None):
+    # grid maps StrategyParams field -> candidate values; samples picks a random subset
+    names = list(grid)
+    combinations = list(itertools.product(*(grid[name] for name in names)))
+    if samples is not None and samples < len(combinations):
+        combinations = random.Random(seed).sample(combinations, samples)
+    defaults = asdict(StrategyParams())
+    return [{**defaults, **dict(zip(names, values))} for values in combinations]
+
+
+def sweep(path, grid, samples=None, seed=None, workers=None, mode='poll', trade_interval=TRADE_INTERVAL, max_tokens=MAX_TOKENS):
+    global worker_events
+    settings = {'mode': mode, 'trade_interval': trade_interval, 'max_tokens': max_tokens}
+    worker_events = list(load_events(path))
+    try:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), initializer=init_worker,
+                                 initargs=(path, settings)) as pool:
+            results = list(pool.map(run_params, parameter_grid(grid, samples, seed)))
+    finally:
+        worker_events = None
+    return sorted(results, key=lambda result: result['profit_loss'], reverse=True)
+
+
+def parse_grid(specs):
+    # "max_age_ms=60000,300000" -> {'max_age_ms': [60000.0, 300000.0]}
+    known = {field.name for field in fields(StrategyParams)}
+    grid = {}
+    for spec in specs:
+        name, _, values = spec.partition('=')
+        if name not in known:
+            raise SystemExit(f"Unknown parameter {name!r}, expected one of: {', '.join(sorted(known))}")
+        grid[name] = [float(value) for value in values.split(',')]
+    return grid
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest a grid of strategy parameters on recorded events")
+    parser.add_argument('events', help="feed recording directory, tick store (.db) or NDJSON file of recorded Socket.IO events")
+    parser.add_argument('grid', nargs='+', help="parameter=value1,value2,... for any StrategyParams field")
+    parser.add_argument('--samples', type=int, help="evaluate a random sample of this many parameter sets")
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--workers', type=int, help="worker processes (default: all CPU cores)")
+    parser.add_argument('--mode', choices=['poll', 'event'], default='poll')
+    parser.add_argument('--trade-interval', type=float, default=TRADE_INTERVAL)
+    parser.add_argument('--max-tokens', type=int, default=MAX_TOKENS)
+    parser.add_argument('--top', type=int, default=20, help="rows to print")
+    args = parser.parse_args()
+
+    grid = parse_grid(args.grid)
+    results = sweep(args.events, grid, samples=args.samples, seed=args.seed, workers=args.workers,
+                    mode=args.mode, trade_interval=args.trade_interval, max_tokens=args.max_tokens)
+
+    names = list(grid)
+    print(' '.join(f"{name:>18}" for name in names) + f" {'PnL $':>12} {'PnL %':>9} {'Max DD %':>9} {'Fills':>7}")
+    for result in results[:args.top]:
+        values = ' '.join(f"{result['params'][name]:>18g}" for name in names)
+        print(f"{values} {result['profit_loss']:>12.2f} {result['profit_loss_percentage']:>9.2f} "
+              f"{result['max_drawdown_percentage']:>9.2f} {result['fills']:>7}")
+
+
+if __name__ == '__main__':
+    main()
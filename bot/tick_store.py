@@ -0,0 +1,94 @@
+import os
+import sqlite3
+import time
+from .events import coin_time_ms, trade_time_ms
+from .paths import data_path
+
+# SQLite file holding every coin and trade event
+TICK_STORE_PATH = os.environ.get('PUMPEDUP_TICK_STORE') or data_path('market_data.db')
+TICK_BATCH_SIZE = 500  # Buffered events written per transaction
+TICK_FLUSH_INTERVAL = 5  # Seconds before a partial batch is written
+
+COIN_COLUMNS = ['timestamp', 'mint', 'symbol', 'name', 'creator', 'market_cap', 'usd_market_cap',
+                'virtual_sol_reserves', 'virtual_token_reserves']
+TRADE_COLUMNS = ['timestamp', 'mint', 'symbol', 'signature', 'is_buy', 'sol_amount', 'token_amount', 'user',
+                 'market_cap', 'usd_market_cap', 'virtual_sol_reserves', 'virtual_token_reserves']
+
+
+class TickStore:
+    # Append-only history of coin and trade events, indexed by event time (ms).
+    # Events are buffered and written in batches, on the IOWorker thread when a writer is
+    # given; WAL mode lets the dashboard read time ranges while the bot keeps appending.
+    # A read-only store never creates the file or its tables; the bot owns the schema.
+    def __init__(self, path=TICK_STORE_PATH, batch_size=TICK_BATCH_SIZE, flush_interval=TICK_FLUSH_INTERVAL, writer=None,
+                 readonly=False):
+        self.path = path
+        self.writer = writer
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.coin_rows = []
+        self.trade_rows = []
+        self.last_flush = time.monotonic()
+        if readonly:
+            self.db = sqlite3.connect(f'file:{path}?mode=ro', uri=True, check_same_thread=False)
+            self.db.row_factory = sqlite3.Row
+            return
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.execute(f"CREATE TABLE IF NOT EXISTS coins ({', '.join(COIN_COLUMNS)})")
+        self.db.execute(f"CREATE TABLE IF NOT EXISTS trades ({', '.join(TRADE_COLUMNS)})")
+        self.db.execute('CREATE INDEX IF NOT EXISTS coins_timestamp ON coins (timestamp)')
+        self.db.execute('CREATE INDEX IF NOT EXISTS trades_timestamp ON trades (timestamp)')
+        self.db.commit()
+
+    def append_coin(self, coin_data):
+        self.coin_rows.append((coin_time_ms(coin_data),) + tuple(coin_data.get(column) for column in COIN_COLUMNS[1:]))
+        self._maybe_flush()
+
+    def append_trade(self, trade_data):
+        self.trade_rows.append((trade_time_ms(trade_data),) + tuple(trade_data.get(column) for column in TRADE_COLUMNS[1:]))
+        self._maybe_flush()
+
+    def flush(self):
+        coin_rows, self.coin_rows = self.coin_rows, []
+        trade_rows, self.trade_rows = self.trade_rows, []
+        self.last_flush = time.monotonic()
+        if not coin_rows and not trade_rows:
+            return
+        if self.writer:
+            self.writer.submit(self._write, coin_rows, trade_rows)
+        else:
+            self._write(coin_rows, trade_rows)
+
+    def _write(self, coin_rows, trade_rows):
+        with self.db:
+            self.db.executemany(f"INSERT INTO coins VALUES ({', '.join('?' * len(COIN_COLUMNS))})", coin_rows)
+            self.db.executemany(f"INSERT INTO trades VALUES ({', '.join('?' * len(TRADE_COLUMNS))})", trade_rows)
+
+    def read_coins(self, start_ms=0, end_ms=None):
+        return self._read('coins', start_ms, end_ms)
+
+    def read_trades(self, start_ms=0, end_ms=None):
+        return self._read('trades', start_ms, end_ms)
+
+    def close(self):
+        self.flush()
+        if self.writer:
+            self.writer.submit(self.db.close)
+        else:
+            self.db.close()
+
+    def _read(self, table, start_ms, end_ms):
+        # Rows are yielded lazily in event time order
+        if end_ms is None:
+            end_ms = 2 ** 63 - 1
+        cursor = self.db.execute(f'SELECT * FROM {table} WHERE timestamp >= ? AND timestamp < ? ORDER BY timestamp',
+                                 (start_ms, end_ms))
+        for row in cursor:
+            yield dict(row)
+
+    def _maybe_flush(self):
+        if len(self.coin_rows) + len(self.trade_rows) >= self.batch_size or time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
@@ -0,0 +1,65 @@
+import numpy as np
+
+INITIAL_CAPACITY = 1024  # Rows allocated up front; the arrays double when full
+FIELDS = ('created_timestamp', 'usd_market_cap', 'initial_usd_market_cap',
+          'virtual_sol_reserves', 'virtual_token_reserves', 'token_amount')
+HOLD, BUY, SELL = 0, 1, 2
+ACTIONS = {BUY: 'buy', SELL: 'sell'}
+
+
+class TokenArrays:
+    # Struct-of-arrays copy of the token fields generate_trade_signal reads,
+    # so signals for every tracked token are evaluated in one vectorized pass.
+    def __init__(self, capacity=INITIAL_CAPACITY):
+        self.rows = {}  # mint -> row
+        self.mints = np.empty(capacity, dtype=object)
+        self.active = np.zeros(capacity, dtype=bool)
+        self.columns = {name: np.zeros(capacity) for name in FIELDS}
+        self.free = list(range(capacity - 1, -1, -1))
+
+    def __len__(self):
+        return len(self.rows)
+
+    def update(self, mint, token_data):
+        row = self.rows.get(mint)
+        if row is None:
+            if not self.free:
+                self._grow()
+            row = self.rows[mint] = self.free.pop()
+            self.mints[row] = mint
+            self.active[row] = True
+        for name in FIELDS:
+            if name in token_data:
+                self.columns[name][row] = float(token_data[name] or 0)
+
+    def remove(self, mint):
+        row = self.rows.pop(mint, None)
+        if row is None:
+            return
+        self.active[row] = False
+        self.mints[row] = None
+        for column in self.columns.values():
+            column[row] = 0
+        self.free.append(row)
+
+    def evaluate(self, params, now_ms):
+        # Returns (mints, actions, amounts) for every non-hold token, newest and largest first
+        columns = self.columns
+        usd_market_cap = columns['usd_market_cap']
+        buy = self.active & (now_ms - columns['created_timestamp'] < params.max_age_ms) & (usd_market_cap < params.max_buy_market_cap)
+        sell = (self.active & ~buy & (usd_market_cap > params.min_sell_market_cap)
+                & (usd_market_cap > columns['initial_usd_market_cap'] * params.sell_multiple))
+        actions = np.where(buy, BUY, np.where(sell, SELL, HOLD))
+        amounts = np.where(buy, np.minimum(params.max_buy_usd, usd_market_cap * params.buy_fraction),
+                           np.where(sell, columns['token_amount'] * params.sell_fraction, 0.0))
+        rows = np.flatnonzero(actions)
+        rows = rows[np.lexsort((-usd_market_cap[rows], -columns['created_timestamp'][rows]))]
+        return self.mints[rows], actions[rows], amounts[rows]
+
+    def _grow(self):
+        capacity = len(self.active)
+        self.mints = np.concatenate([self.mints, np.empty(capacity, dtype=object)])
+        self.active = np.concatenate([self.active, np.zeros(capacity, dtype=bool)])
+        for name in FIELDS:
+            self.columns[name] = np.concatenate([self.columns[name], np.zeros(capacity)])
+        self.free.extend(range(2 * capacity - 1, capacity - 1, -1))
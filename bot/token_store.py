@@ -0,0 +1,69 @@
+import heapq
+from collections import OrderedDict
+from collections.abc import Mapping
+
+
+class TokenStore(Mapping):
+    # Token data keyed by mint with cheap eviction.
+    # Creation order is kept in a heap on created_timestamp (O(log n) eviction of the
+    # oldest token) and activity order in an OrderedDict moved on every trade
+    # (O(1) eviction of the least recently traded token).
+    def __init__(self):
+        self.tokens = {}
+        self.created_heap = []
+        self.activity = OrderedDict()
+
+    def __getitem__(self, mint):
+        return self.tokens[mint]
+
+    def __iter__(self):
+        return iter(self.tokens)
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def __contains__(self, mint):
+        return mint in self.tokens
+
+    def add(self, token, activity_ms=None):
+        mint = token['mint']
+        created_timestamp = token.get('created_timestamp') or 0
+        self.tokens[mint] = token
+        heapq.heappush(self.created_heap, (created_timestamp, mint))
+        self.touch(mint, created_timestamp if activity_ms is None else activity_ms)
+        if len(self.created_heap) > 2 * len(self.tokens) + 64:
+            self._compact()
+
+    def touch(self, mint, activity_ms):
+        if mint in self.tokens:
+            self.activity[mint] = activity_ms
+            self.activity.move_to_end(mint)
+
+    def remove(self, mint):
+        self.activity.pop(mint, None)
+        return self.tokens.pop(mint, None)
+
+    def evict_oldest(self):
+        # Heap entries of tokens that were removed or re-added are skipped lazily
+        while self.created_heap:
+            created_timestamp, mint = heapq.heappop(self.created_heap)
+            token = self.tokens.get(mint)
+            if token is not None and (token.get('created_timestamp') or 0) == created_timestamp:
+                self.remove(mint)
+                return mint
+        return None
+
+    def evict_inactive(self, cutoff_ms):
+        # Evicts every token whose last activity is older than cutoff_ms
+        evicted = []
+        while self.activity:
+            mint, activity_ms = next(iter(self.activity.items()))
+            if activity_ms >= cutoff_ms:
+                break
+            self.remove(mint)
+            evicted.append(mint)
+        return evicted
+
+    def _compact(self):
+        self.created_heap = [(token.get('created_timestamp') or 0, mint) for mint, token in self.tokens.items()]
+        heapq.heapify(self.created_heap)
@@ -1,15 +1,41 @@
 import asyncio
 from .ai_strategy import AIStrategy
+from .journal import JOURNAL_DIR, TradeJournal
+from .paths import data_path
+from .metrics import registry
+from .positions import PositionBook
 import csv
+import os
+import time
+from collections import deque
 from datetime import datetime
 
+DECISION_DEBOUNCE = 0.2  # Seconds to collect feed events before evaluating the affected tokens
+MAX_DECISIONS_PER_SECOND = 5  # Maximum number of trades executed per second in event-driven mode
+MAX_LATENCY_SAMPLES = 1000  # Number of decision latencies kept for reporting
+MAX_RECENT_TRADES = 100  # Number of executed trades kept in memory
+
+DECISION_SECONDS = registry.histogram('pumpedup_decision_seconds', "execute_trade signal-to-fill time", ('status',))
+EVENT_TO_TRADE_SECONDS = registry.histogram('pumpedup_event_to_trade_seconds',
+                                            "Feed event to executed trade in event-driven mode")
+
 class TradingBot:
-    def __init__(self, strategy: AIStrategy):
+    def __init__(self, strategy: AIStrategy, journal_dir=JOURNAL_DIR, io_worker=None):
         self.strategy = strategy
-        self.portfolio = {}
+        self.io_worker = io_worker  # IOWorker taking journal writes and snapshots off the event loop
+        self.positions = PositionBook()
         self.initial_balance = 1000  # Starting with 1000 USD
         self.balance = self.initial_balance
-        self.trades = []
+        self.trades = deque(maxlen=MAX_RECENT_TRADES)
+        self.journal = TradeJournal(journal_dir) if journal_dir else None
+        if self.journal:
+            self.restore_from_journal()
+        self.pending_tokens = {}
+        self.pending_event = None
+        self.decision_task = None
+        self.decision_latencies = deque(maxlen=MAX_LATENCY_SAMPLES)
+        # Feed events re-mark held tokens so portfolio value is always current
+        self.strategy.add_listener(self.mark_position)
 
     def get_last_price(self, symbol):
         token_data = self.strategy.tokens_data.get(symbol)
@@ -23,28 +49,53 @@ class TradingBot:
     async def execute_trade(self):
         try:
             symbol = await self.strategy.select_token()
-            if not symbol:
-                return {"status": "info", "message": "No suitable token found for trading"}
-            
-            action, amount = await self.strategy.generate_trade_signal(symbol)
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+        if not symbol:
+            return {"status": "info", "message": "No suitable token found for trading"}
+        return await self.execute_trade_for(symbol)
+
+    async def execute_trades(self, max_trades):
+        # Acts on up to max_trades candidates from one vectorized signal pass
+        try:
+            signals = await self.strategy.generate_trade_signals(limit=max_trades)
+        except Exception as e:
+            return [{"status": "error", "message": str(e)}]
+        if not signals:
+            return [{"status": "info", "message": "No trade executed"}]
+        return [await self.execute_trade_for(symbol, (action, amount)) for symbol, action, amount in signals]
+
+    async def execute_trade_for(self, symbol, signal=None):
+        started = time.perf_counter()
+        result = await self._execute_trade_for(symbol, signal)
+        DECISION_SECONDS.observe(time.perf_counter() - started, result['status'])
+        return result
+
+    async def _execute_trade_for(self, symbol, signal):
+        try:
+            action, amount = signal or await self.strategy.generate_trade_signal(symbol)
             last_price = self.get_last_price(symbol)
             
             if last_price is None:
                 return {"status": "error", "message": f"Unable to determine price for {symbol}"}
             
             if action == 'buy':
-                cost = min(amount, self.balance)
+                cost = min(amount or 0, self.balance)
+                if cost <= 0:
+                    return {"status": "info", "message": f"Not enough balance to buy {symbol}"}
                 tokens_bought = cost / last_price
                 self.balance -= cost
-                self.update_portfolio(symbol, tokens_bought, 'buy')
+                self.update_portfolio(symbol, tokens_bought, 'buy', cost, last_price)
                 self.log_trade(symbol, 'buy', tokens_bought, cost)
                 return {"status": "success", "message": f"Bought {tokens_bought:.6f} {symbol} for ${cost:.2f}"}
             elif action == 'sell':
-                if symbol in self.portfolio:
-                    sell_amount = min(amount, self.portfolio[symbol])
+                if symbol in self.positions:
+                    sell_amount = min(amount or 0, self.positions.quantity(symbol))
+                    if sell_amount <= 0:
+                        return {"status": "info", "message": f"Nothing to sell for {symbol}"}
                     revenue = sell_amount * last_price
                     self.balance += revenue
-                    self.update_portfolio(symbol, sell_amount, 'sell')
+                    self.update_portfolio(symbol, sell_amount, 'sell', revenue, last_price)
                     self.log_trade(symbol, 'sell', sell_amount, revenue)
                     return {"status": "success", "message": f"Sold {sell_amount:.6f} {symbol} for ${revenue:.2f}"}
                 else:
@@ -54,21 +105,80 @@ class TradingBot:
         except Exception as e:
             return {"status": "error", "message": str(e)}
 
-    def update_portfolio(self, symbol, amount, action):
-        if symbol not in self.portfolio:
-            self.portfolio[symbol] = 0
+    def start_event_driven(self, debounce=DECISION_DEBOUNCE, max_decisions_per_second=MAX_DECISIONS_PER_SECOND):
+        # Evaluates signals only for tokens touched by the feed instead of polling select_token
+        self.debounce = debounce
+        self.decision_interval = 1 / max_decisions_per_second
+        self.pending_event = asyncio.Event()
+        self.strategy.add_listener(self.on_token_event)
+        if self.decision_task is None or self.decision_task.done():
+            self.decision_task = asyncio.create_task(self.run_event_driven())
+
+    def stop_event_driven(self):
+        if self.decision_task:
+            self.decision_task.cancel()
+            self.decision_task = None
+
+    def on_token_event(self, symbol):
+        if self.pending_event is None:
+            return
+        # Keep the time of the first unhandled event so latency covers the debounce wait
+        self.pending_tokens.setdefault(symbol, time.monotonic())
+        self.pending_event.set()
+
+    async def run_event_driven(self):
+        last_decision = 0
+        while True:
+            await self.pending_event.wait()
+            await asyncio.sleep(self.debounce)
+            self.pending_event.clear()
+            pending, self.pending_tokens = self.pending_tokens, {}
+            for symbol, event_time in pending.items():
+                try:
+                    signal = await self.strategy.generate_trade_signal(symbol)
+                except Exception as e:
+                    print(f"Error generating signal for {symbol}: {e}")
+                    continue
+                if signal[0] == 'hold':
+                    continue
+                wait = last_decision + self.decision_interval - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                last_decision = time.monotonic()
+                result = await self.execute_trade_for(symbol, signal)
+                if result['status'] == 'success':  # Only real fills; skipped trades report info
+                    self.decision_latencies.append(time.monotonic() - event_time)
+                    EVENT_TO_TRADE_SECONDS.observe(time.monotonic() - event_time)
+                print(result)
+
+    def get_decision_latency(self):
+        if not self.decision_latencies:
+            return None
+        latencies = sorted(self.decision_latencies)
+        return {
+            'count': len(latencies),
+            'p50_ms': latencies[len(latencies) // 2] * 1000,
+            'p99_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+            'max_ms': latencies[-1] * 1000,
+        }
+
+    def update_portfolio(self, symbol, amount, action, total, price=None):
+        # total is the USD cost of a buy or the revenue of a sell
         if action == 'buy':
-            self.portfolio[symbol] += amount
+            self.positions.buy(symbol, amount, total, price)
         elif action == 'sell':
-            self.portfolio[symbol] = max(0, self.portfolio[symbol] - amount)
+            self.positions.sell(symbol, amount, total, price)
+
+    def mark_position(self, symbol):
+        if symbol in self.positions:
+            self.positions.mark(symbol, self.get_last_price(symbol))
 
     def get_portfolio(self):
-        return {symbol: {"amount": amount, "value": amount * self.get_last_price(symbol) if self.get_last_price(symbol) else 0} 
-                for symbol, amount in self.portfolio.items()}
+        return {symbol: {"amount": position.quantity, "value": position.value}
+                for symbol, position in self.positions.items()}
 
     def get_total_value(self):
-        return self.balance + sum(self.portfolio[symbol] * self.get_last_price(symbol)
-                                  for symbol in self.portfolio if self.get_last_price(symbol))
+        return self.balance + self.positions.market_value
 
     def get_profit_loss(self):
         current_value = self.get_total_value()
@@ -79,54 +189,102 @@ class TradingBot:
         pl_amount, pl_percentage = self.get_profit_loss()
         insights += f"\nBot Performance:\n"
         insights += f"Initial Balance: ${self.initial_balance:.2f}\n"
-        insights += f"Current Total Value: ${self.get_total_value():.2f}\n"
+        insights += f"Current Total Value: ${pl_amount + self.initial_balance:.2f}\n"
         insights += f"Profit/Loss: ${pl_amount:.2f} ({pl_percentage:.2f}%)\n"
+        insights += f"Realized: ${self.positions.realized:.2f}, Unrealized: ${self.positions.unrealized:.2f}\n"
+        if self.io_worker:
+            stats = self.io_worker.stats()
+            insights += f"Background writes: {stats['queued']} queued, {stats['completed']} done, {stats['dropped']} skipped, {stats['failed']} failed\n"
+        latency = self.get_decision_latency()
+        if latency:
+            insights += f"Decision latency: p50 {latency['p50_ms']:.1f}ms, p99 {latency['p99_ms']:.1f}ms, max {latency['max_ms']:.1f}ms over {latency['count']} trades\n"
         return insights
 
     def log_trade(self, symbol, action, amount, price):
-        self.trades.append({
-            'timestamp': datetime.now().isoformat(),
+        trade = {
+            'timestamp': datetime.fromtimestamp(self.strategy.clock()).isoformat(),
             'symbol': symbol,
             'action': action,
             'amount': amount,
             'price': price
-        })
-        self.save_trades_to_csv()
+        }
+        self.trades.append(trade)
+        if self.journal:
+            self.persist(self.journal.append, trade)
+
+    def persist(self, job, *args, droppable=False):
+        # Disk work goes to the I/O worker when there is one, otherwise it runs inline
+        if self.io_worker:
+            return self.io_worker.submit(job, *args, droppable=droppable)
+        job(*args)
+        return True
+
+    def restore_from_journal(self):
+        # Rebuilds balance and holdings by replaying every journaled fill
+        restored = 0
+        for trade in self.journal.replay():
+            if trade['action'] == 'buy':
+                self.balance -= trade['price']
+            elif trade['action'] == 'sell':
+                self.balance += trade['price']
+            # The journal's price column is the fill's USD total; holdings are marked at the fill price
+            # until their token trades again
+            fill_price = trade['price'] / trade['amount'] if trade['amount'] else None
+            self.update_portfolio(trade['symbol'], trade['amount'], trade['action'], trade['price'], fill_price)
+            self.trades.append(trade)
+            restored += 1
+        if restored:
+            print(f"Restored {restored} trades from {self.journal.directory}, balance ${self.balance:.2f}")
 
-    def save_trades_to_csv(self):
-        with open('trades.csv', 'w', newline='') as csvfile:
-            fieldnames = ['timestamp', 'symbol', 'action', 'amount', 'price']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            for trade in self.trades:
-                writer.writerow(trade)
+    def close(self):
+        # Pending writes are finished before the files are closed
+        if self.journal:
+            self.persist(self.journal.close)
+        if self.strategy.tick_store:
+            self.strategy.tick_store.close()
+        if self.strategy.recorder:
+            self.strategy.recorder.close()
+        if self.io_worker:
+            self.io_worker.close()
+
+    def sync(self):
+        if self.journal:
+            self.persist(self.journal.sync)
 
     def save_market_data(self):
-        with open('market_data1.csv', 'w', newline='') as csvfile:
-            fieldnames = ['timestamp', 'created_timestamp', 'symbol', 'name', 'symbol_address', 'image_url',
-                          'username', 'signature', 'creator', 'creator_username', 'timestamp', 'reply_count', 'price', 'market_cap', 'usd_market_cap']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            for symbol, data in self.strategy.tokens_data.items():
-                price = self.get_last_price(symbol)
-                # writer.writerow(data)
-
-                writer.writerow({
-                    'timestamp': datetime.now().isoformat(),
-                    'created_timestamp': data.get('created_timestamp', 'N/A'),
-                    'symbol': symbol,
-                    'name': data.get('name', 'N/A'),
-                    'symbol_address': data.get('symbol', 'N/A'),
-                    'image_url': data.get('image_url', 'N/A'),
-                    'username': data.get('username', 'N/A'), 'signature': data.get('signature', 'N/A'),
-                    'creator': data.get('creator', 'N/A'),
-                    'creator_username': data.get('creator_username', 'N/A'),
-                    'timestamp': data.get('timestamp', 'N/A'),
-                    'reply_count': data.get('reply_count', 'N/A'),
-                    'price': price if price else 'N/A',
-                    'market_cap': data.get('market_cap', 'N/A'),
-                    'usd_market_cap': data.get('usd_market_cap', 'N/A')
-                })
+        # History lives in the tick store; market_data1.csv only holds the current snapshot.
+        # The snapshot is taken here, on the event loop; formatting and writing happen on the I/O worker.
+        if self.strategy.tick_store:
+            self.strategy.tick_store.flush()
+        snapshot = [({**self.strategy.display.get(symbol), **token.to_dict()}, symbol, self.get_last_price(symbol))
+                    for symbol, token in self.strategy.tokens_data.items()]
+        self.persist(write_market_data, snapshot, datetime.now().isoformat(), droppable=True)
 
     def start(self):
-        self.strategy.start_websocket()
\ No newline at end of file
+        self.strategy.start_websocket()
+
+def write_market_data(snapshot, now, path=data_path('market_data1.csv')):
+    # Written to a temporary file first so readers never see a half-written snapshot
+    fieldnames = ['timestamp', 'created_timestamp', 'symbol', 'name', 'symbol_address', 'image_url',
+                  'username', 'signature', 'creator', 'creator_username', 'timestamp', 'reply_count', 'price', 'market_cap', 'usd_market_cap']
+    with open(path + '.tmp', 'w', newline='') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        writer.writeheader()
+        for data, symbol, price in snapshot:
+            writer.writerow({
+                'timestamp': now,
+                'created_timestamp': data.get('created_timestamp', 'N/A'),
+                'symbol': symbol,
+                'name': data.get('name', 'N/A'),
+                'symbol_address': data.get('symbol', 'N/A'),
+                'image_url': data.get('image_url', 'N/A'),
+                'username': data.get('username', 'N/A'), 'signature': data.get('signature', 'N/A'),
+                'creator': data.get('creator', 'N/A'),
+                'creator_username': data.get('creator_username', 'N/A'),
+                'timestamp': data.get('timestamp', 'N/A'),
+                'reply_count': data.get('reply_count', 'N/A'),
+                'price': price if price else 'N/A',
+                'market_cap': data.get('market_cap', 'N/A'),
+                'usd_market_cap': data.get('usd_market_cap', 'N/A')
+            })
+    os.replace(path + '.tmp', path)
@@ -1,52 +1,146 @@
+import argparse
 import asyncio
-from bot.trading_bot import TradingBot
+import os
+import signal
+import threading
+from urllib.parse import urlsplit
+from bot.trading_bot import TradingBot, DECISION_DEBOUNCE, MAX_DECISIONS_PER_SECOND
 from bot.ai_strategy import AIStrategy
+from bot.event_bus import EventBus
+from bot.io_worker import IOWorker
+from bot.journal import FSYNC_INTERVAL
+from bot.metrics import METRICS_PORT, monitor_loop_lag, registry, serve_metrics
+from bot.publisher import DASHBOARD_URL, EventPublisher
+from bot.recorder import FeedRecorder
+from bot.tick_store import TickStore
 
-async def main():
-    strategy = AIStrategy()
-    bot = TradingBot(strategy)
+def start_dashboard(bus, bot, loop, port):
+    # Runs app.py's server in a thread of this process; strategy events reach it through the bus
+    os.environ['PUMPEDUP_ASYNC_MODE'] = 'threading'
+    import app as dashboard
+
+    async def read_portfolio():
+        pl_amount, pl_percentage = bot.get_profit_loss()
+        return {
+            'balance': bot.balance,
+            'total_value': bot.get_total_value(),
+            'profit_loss': pl_amount,
+            'profit_loss_percentage': pl_percentage,
+            'portfolio': bot.get_portfolio(),
+        }
+
+    # Bot state belongs to the event loop, so dashboard requests read it there
+    dashboard.portfolio_source = lambda: asyncio.run_coroutine_threadsafe(read_portfolio(), loop).result(timeout=5)
+    dashboard.load_market_stats()
+    bus.subscribe(dashboard.ingest_events)
+    thread = threading.Thread(target=dashboard.socketio.run, args=(dashboard.app,), daemon=True,
+                              kwargs={'host': '0.0.0.0', 'port': port, 'allow_unsafe_werkzeug': True})
+    thread.start()
+    print(f"Dashboard running in-process on port {port}")
+
+async def main(args):
+    publisher = EventBus() if args.single_process else EventPublisher()
+    io_worker = IOWorker()
+    strategy = AIStrategy(publisher=publisher, tick_store=TickStore(writer=io_worker),
+                          ws_urls=args.feed_url, feed_connections=args.feed_connections,
+                          recorder=FeedRecorder(args.record) if args.record else None)
+    bot = TradingBot(strategy, io_worker=io_worker)
+    if args.single_process:
+        start_dashboard(publisher, bot, asyncio.get_running_loop(), args.dashboard_port)
+    registry.gauge('pumpedup_publish_queue_depth', "Events waiting for the dashboard", lambda: publisher.stats()['queued'])
+    registry.gauge('pumpedup_publish_dropped', "Events dropped on the way to the dashboard", lambda: publisher.stats()['dropped'])
+    registry.gauge('pumpedup_io_queue_depth', "Writes waiting for the I/O worker", lambda: io_worker.stats()['queued'])
+    registry.gauge('pumpedup_tokens_tracked', "Tokens held by the strategy", lambda: len(strategy.tokens_data))
+    registry.gauge('pumpedup_portfolio_value', "Balance plus marked holdings in USD", bot.get_total_value)
+    loop_lag_task = asyncio.create_task(monitor_loop_lag())
+    metrics_server = await serve_metrics(port=args.metrics_port) if args.metrics_port else None
     
     print("getting pumpedup...")
     print("talking to pump.fun...")
     
-    bot.start()
-
-    # Give some time for the websocket to connect and receive initial data
-    await asyncio.sleep(10)
-
-    async def periodic_trade():
-        while True:
-            try:
-                result = await bot.execute_trade()
-                print(result)
-            except Exception as e:
-                print(f"Error executing trade: {e}")
-            await asyncio.sleep(60)  # Wait for 60 seconds before the next trade attempt
-
-    async def periodic_insights():
-        while True:
-            try:
-                insights = await bot.get_market_insights()
-                print("\nMarket Insights and Bot Performance:")
-                print(insights)
-                print("\nCurrent Portfolio:")
-                portfolio = bot.get_portfolio()
-                for symbol, data in portfolio.items():
-                    print(f"{symbol}: Amount: {data['amount']:.6f}, Value: ${data['value']:.2f}")
-                bot.save_market_data()
-            except Exception as e:
-                print(f"Error generating insights: {e}")
-            await asyncio.sleep(300)  # Generate insights every 5 minutes
-
-    trade_task = asyncio.create_task(periodic_trade())
-    insights_task = asyncio.create_task(periodic_insights())
+    # docker stop and supervisord send SIGTERM: cancel like Ctrl+C so the cleanup below still runs
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
 
     try:
-        await asyncio.gather(trade_task, insights_task)
+        bot.start()
+
+        if args.mode == 'event':
+            bot.start_event_driven(debounce=args.debounce, max_decisions_per_second=args.max_decisions_per_second)
+
+        # Give some time for the websocket to connect and receive initial data
+        await asyncio.sleep(10)
+
+        async def periodic_trade():
+            while True:
+                try:
+                    if args.max_trades_per_cycle > 1:
+                        for result in await bot.execute_trades(args.max_trades_per_cycle):
+                            print(result)
+                    else:
+                        result = await bot.execute_trade()
+                        print(result)
+                except Exception as e:
+                    print(f"Error executing trade: {e}")
+                await asyncio.sleep(60)  # Wait for 60 seconds before the next trade attempt
+
+        async def periodic_insights():
+            while True:
+                try:
+                    insights = await bot.get_market_insights()
+                    print("\nMarket Insights and Bot Performance:")
+                    print(insights)
+                    print("\nCurrent Portfolio:")
+                    portfolio = bot.get_portfolio()
+                    for symbol, data in portfolio.items():
+                        print(f"{symbol}: Amount: {data['amount']:.6f}, Value: ${data['value']:.2f}")
+                    bot.save_market_data()
+                except Exception as e:
+                    print(f"Error generating insights: {e}")
+                await asyncio.sleep(300)  # Generate insights every 5 minutes
+
+        async def periodic_sync():
+            # Fills written since the last fsync reach the disk within FSYNC_INTERVAL, even when no more trades follow
+            while True:
+                await asyncio.sleep(FSYNC_INTERVAL)
+                bot.sync()
+
+        tasks = [asyncio.create_task(periodic_insights()), asyncio.create_task(periodic_sync())]
+        if args.mode == 'poll':
+            tasks.append(asyncio.create_task(periodic_trade()))
+
+        await asyncio.gather(*tasks)
     except asyncio.CancelledError:
         print("Bot operation cancelled.")
     finally:
+        loop_lag_task.cancel()
+        if metrics_server:
+            metrics_server.close()
+        bot.stop_event_driven()
         strategy.stop_websocket()
+        bot.close()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="pumpedup trading bot")
+    parser.add_argument('--mode', choices=['poll', 'event'], default='poll',
+                        help="poll: trade every 60 seconds; event: evaluate tokens as feed events arrive")
+    parser.add_argument('--debounce', type=float, default=DECISION_DEBOUNCE,
+                        help="seconds to collect feed events before deciding (event mode)")
+    parser.add_argument('--max-decisions-per-second', type=float, default=MAX_DECISIONS_PER_SECOND,
+                        help="maximum trades executed per second (event mode)")
+    parser.add_argument('--max-trades-per-cycle', type=int, default=1,
+                        help="act on up to this many tokens per cycle using batch signals (poll mode)")
+    parser.add_argument('--feed-url', action='append',
+                        help="websocket feed URL; repeat to spread connections over several endpoints")
+    parser.add_argument('--feed-connections', type=int, default=1,
+                        help="parallel feed connections; duplicate events are dropped and the first copy wins")
+    parser.add_argument('--single-process', action='store_true',
+                        help="serve the dashboard from this process and pass events to it in memory instead of over HTTP")
+    parser.add_argument('--dashboard-port', type=int, default=urlsplit(DASHBOARD_URL).port,
+                        help="dashboard port (single-process mode)")
+    parser.add_argument('--metrics-port', type=int, default=METRICS_PORT,
+                        help="serve Prometheus metrics on this port (0 disables)")
+    parser.add_argument('--record', metavar='DIR', help="record raw feed frames into this directory")
+    return parser.parse_args()
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main(parse_args()))
\ No newline at end of file